@@ -0,0 +1,111 @@
+"""
+Base de dados compartilhada entre sessões do dashboard.
+
+A base é lida e convertida uma única vez por processo e todas as sessões
+recebem o MESMO objeto. Para isso ser seguro, cada coluna fica apoiada em
+um array NumPy somente leitura (alterar valores gera erro) e a base é uma
+BaseSomenteLeitura, que bloqueia mudanças de estrutura (criar, remover ou
+renomear colunas, operações inplace). Filtros, seleções e cópias da base
+voltam como DataFrame comum, livre para a sessão alterar.
+"""
+
+import pandas as pd
+
+## Colunas de texto com poucos valores distintos (viram 'category' para economizar memória)
+COLUNAS_CATEGORICAS = ['genero', 'assinatura', 'duracao_contrato']
+
+
+def _somente_leitura(array):
+    """
+    Marca um array como somente leitura (sem copiar os dados).
+    """
+    array.flags.writeable = False
+    return array
+
+
+class BaseSomenteLeitura(pd.DataFrame):
+    """
+    DataFrame compartilhado que não aceita mudanças de estrutura.
+
+    Bloqueia criar/alterar/remover colunas (df['x'] = ..., del, insert, pop),
+    trocar colunas/índice, incluir linhas com .loc e métodos com inplace=True.
+    Os valores em si são protegidos pelos arrays somente leitura.
+    """
+
+    @property
+    def _constructor(self):
+        # Resultados derivados (filtros, cópias, seleções) são DataFrames comuns
+        return pd.DataFrame
+
+    def _bloquear(self, *args, **kwargs):
+        raise ValueError("A base compartilhada é somente leitura: faça uma cópia (df.copy()) para alterá-la")
+
+    __setitem__ = _bloquear
+    __delitem__ = _bloquear
+    insert = _bloquear
+    pop = _bloquear
+    _update_inplace = _bloquear  # usado por todos os métodos com inplace=True
+
+    def __setattr__(self, nome, valor):
+        if self.__dict__.get('_congelada') and (nome in ('_mgr', 'columns', 'index') or nome in self.columns):
+            self._bloquear()
+        if nome.startswith('_'):
+            object.__setattr__(self, nome, valor)
+        else:
+            super().__setattr__(nome, valor)
+
+
+def congelar_dataframe(df):
+    """
+    Cria uma BaseSomenteLeitura a partir de df.
+
+    Cada coluna é copiada uma vez para um array próprio, marcado como somente
+    leitura, e o novo DataFrame é montado sem nova cópia (uma coluna por bloco).
+
+    Args:
+      df: DataFrame de origem
+
+    Returns:
+      BaseSomenteLeitura: DataFrame com colunas somente leitura
+    """
+    colunas = {}
+    for nome in df.columns:
+        serie = df[nome]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigos = _somente_leitura(serie.cat.codes.to_numpy().copy())
+            colunas[nome] = pd.Categorical.from_codes(codigos, dtype=serie.dtype)
+        else:
+            colunas[nome] = _somente_leitura(serie.to_numpy().copy())
+
+    base = BaseSomenteLeitura(colunas, index=pd.RangeIndex(len(df)), copy=False)
+    base._congelada = True
+    return base
+
+
+def preparar_base(df):
+    """
+    Converte tipos da base lida do CSV e a congela para compartilhamento.
+
+    - 'data_cadastro' vira datetime (datas inválidas viram NaT)
+    - Colunas de texto de COLUNAS_CATEGORICAS viram 'category'
+
+    Args:
+      df: DataFrame como lido do CSV
+
+    Returns:
+      BaseSomenteLeitura: DataFrame convertido e somente leitura
+    """
+    df = df.copy()
+    if 'data_cadastro' in df.columns:
+        df['data_cadastro'] = pd.to_datetime(df['data_cadastro'], errors='coerce')
+    for nome in COLUNAS_CATEGORICAS:
+        if nome in df.columns:
+            df[nome] = df[nome].astype('category')
+    return congelar_dataframe(df)
+
+
+def memoria_dataframe(df):
+    """
+    Retorna a memória ocupada pelo DataFrame em bytes (inclui textos).
+    """
+    return int(df.memory_usage(deep=True).sum())
@@ -0,0 +1,182 @@
+"""
+Testes de significância por bootstrap para os insights automáticos.
+
+A diferença de médias entre dois grupos (ex.: atraso de quem cancela vs.
+quem fica) é reamostrada milhares de vezes para obter um intervalo de
+confiança e um p-valor. As reamostras são geradas em lotes, como matrizes
+NumPy (uma linha por reamostra):
+
+- Dados com poucos valores distintos (cancelado, dias_atraso): a média de
+  uma reamostra depende só de quantas vezes cada valor foi sorteado, então
+  cada lote é uma matriz de contagens multinomiais (exato e muito rápido).
+- Demais dados: cada lote é uma matriz de índices sorteados com reposição.
+
+Quando o trabalho é grande, os lotes são divididos entre processos. Quem
+chama com frequência (o app) deve criar um único pool com
+criar_pool_processos e passá-lo em 'executor'; sem ele, cada chamada
+grande cria e fecha o próprio pool.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+## Quantidade padrão de reamostras
+N_REAMOSTRAS_PADRAO = 2000
+
+## Nível de significância dos alertas
+ALFA = 0.05
+
+## Menor tamanho de grupo para o teste (abaixo disso nada é significativo)
+MINIMO_AMOSTRA = 10
+
+## Até quantos valores distintos usar contagens multinomiais (exato; custo
+## proporcional aos valores distintos, não ao tamanho do grupo)
+MAXIMO_VALORES_DISTINTOS = 4096
+
+## Tamanho máximo (elementos) de cada matriz de reamostras
+ELEMENTOS_POR_LOTE = 4_000_000
+
+## A partir de quantos elementos sorteados vale a pena usar vários processos
+LIMITE_PARALELO = 50_000_000
+
+
+def criar_pool_processos(n_processos=None):
+    """
+    Cria um pool de processos para as reamostras, para ser reutilizado.
+
+    Usa 'spawn' para não fazer fork de um processo com várias threads (como
+    o servidor do Streamlit).
+
+    Args:
+      n_processos: Quantidade de processos (None = todos os núcleos)
+
+    Returns:
+      ProcessPoolExecutor: Pool para o parâmetro 'executor' de bootstrap_diferenca_medias
+    """
+    return ProcessPoolExecutor(
+        max_workers=n_processos or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+
+def _medias_reamostradas(valores, n_reamostras, rng):
+    """
+    Calcula a média de n_reamostras reamostras (com reposição) de valores.
+    """
+    n = len(valores)
+    distintos, contagens = np.unique(valores, return_counts=True)
+    medias = np.empty(n_reamostras)
+
+    if len(distintos) <= MAXIMO_VALORES_DISTINTOS:
+        # Matriz (reamostras x valores distintos) de contagens sorteadas
+        lote = max(1, ELEMENTOS_POR_LOTE // len(distintos))
+        for inicio in range(0, n_reamostras, lote):
+            fim = min(inicio + lote, n_reamostras)
+            sorteio = rng.multinomial(n, contagens / n, size=fim - inicio)
+            medias[inicio:fim] = sorteio @ distintos / n
+    else:
+        # Matriz (reamostras x n) de índices sorteados
+        lote = max(1, ELEMENTOS_POR_LOTE // n)
+        for inicio in range(0, n_reamostras, lote):
+            fim = min(inicio + lote, n_reamostras)
+            indices = rng.integers(0, n, size=(fim - inicio, n))
+            medias[inicio:fim] = valores[indices].mean(axis=1)
+
+    return medias
+
+
+def _diferencas_reamostradas(grupo_a, grupo_b, n_reamostras, semente):
+    """
+    Diferenças de médias (a - b) de n_reamostras reamostras independentes.
+
+    Função de módulo para poder rodar em outro processo.
+    """
+    rng = np.random.default_rng(semente)
+    return _medias_reamostradas(grupo_a, n_reamostras, rng) - _medias_reamostradas(grupo_b, n_reamostras, rng)
+
+
+def _usar_processos(grupo_a, grupo_b, n_reamostras, n_processos):
+    """
+    Decide quantos processos usar (1 = sem pool).
+    """
+    if n_processos is not None:
+        return max(1, n_processos)
+
+    # Com contagens multinomiais o custo não depende do tamanho dos grupos
+    muitos_distintos = any(
+        len(np.unique(grupo)) > MAXIMO_VALORES_DISTINTOS for grupo in (grupo_a, grupo_b)
+    )
+    trabalho = (len(grupo_a) + len(grupo_b)) * n_reamostras
+    if muitos_distintos and trabalho >= LIMITE_PARALELO:
+        return os.cpu_count() or 1
+    return 1
+
+
+def bootstrap_diferenca_medias(grupo_a, grupo_b, n_reamostras=N_REAMOSTRAS_PADRAO,
+                               alfa=ALFA, semente=None, n_processos=None, executor=None):
+    """
+    Testa se a média de grupo_a é diferente da média de grupo_b.
+
+    O intervalo de confiança vem dos percentis das diferenças reamostradas.
+    O p-valor (bilateral) compara a diferença observada com as diferenças
+    reamostradas centradas em zero (hipótese de médias iguais).
+
+    Args:
+      grupo_a: Valores do primeiro grupo
+      grupo_b: Valores do segundo grupo
+      n_reamostras: Quantidade de reamostras
+      alfa: Nível de significância (IC de 1 - alfa)
+      semente: Semente aleatória (mesma semente = mesmo resultado)
+      n_processos: Processos para as reamostras (None = automático)
+      executor: Pool de processos reutilizável (criar_pool_processos); None = pool próprio
+
+    Returns:
+      dict: 'diferenca', 'ic_inferior', 'ic_superior', 'p_valor' e 'significativo'
+      (com menos de MINIMO_AMOSTRA valores em algum grupo, IC e p-valor são NaN)
+    """
+    grupo_a = np.asarray(grupo_a, dtype=float)
+    grupo_b = np.asarray(grupo_b, dtype=float)
+    grupo_a = grupo_a[~np.isnan(grupo_a)]
+    grupo_b = grupo_b[~np.isnan(grupo_b)]
+
+    # Grupos muito pequenos: o bootstrap subestima a variação, não há o que testar
+    if len(grupo_a) < MINIMO_AMOSTRA or len(grupo_b) < MINIMO_AMOSTRA:
+        return {
+            'diferenca': grupo_a.mean() - grupo_b.mean() if len(grupo_a) and len(grupo_b) else np.nan,
+            'ic_inferior': np.nan,
+            'ic_superior': np.nan,
+            'p_valor': np.nan,
+            'significativo': False
+        }
+
+    diferenca = grupo_a.mean() - grupo_b.mean()
+
+    # Divide as reamostras em partes com sementes independentes
+    processos = _usar_processos(grupo_a, grupo_b, n_reamostras, n_processos)
+    sementes = np.random.SeedSequence(semente).spawn(processos)
+    partes = [len(p) for p in np.array_split(np.arange(n_reamostras), processos)]
+
+    if processos == 1:
+        diferencas = _diferencas_reamostradas(grupo_a, grupo_b, n_reamostras, sementes[0])
+    else:
+        argumentos = ([grupo_a] * processos, [grupo_b] * processos, partes, sementes)
+        if executor is not None:
+            diferencas = np.concatenate(list(executor.map(_diferencas_reamostradas, *argumentos)))
+        else:
+            with criar_pool_processos(processos) as pool:
+                diferencas = np.concatenate(list(pool.map(_diferencas_reamostradas, *argumentos)))
+
+    ic_inferior, ic_superior = np.percentile(diferencas, [100 * alfa / 2, 100 * (1 - alfa / 2)])
+    extremos = np.sum(np.abs(diferencas - diferenca) >= abs(diferenca))
+    p_valor = (extremos + 1) / (n_reamostras + 1)
+
+    return {
+        'diferenca': diferenca,
+        'ic_inferior': ic_inferior,
+        'ic_superior': ic_superior,
+        'p_valor': p_valor,
+        'significativo': bool(p_valor < alfa)
+    }
@@ -0,0 +1,114 @@
+"""
+Exportação em blocos da base filtrada (CSV ou Parquet).
+
+As linhas são lidas da base em blocos de tamanho fixo e escritas direto no
+destino, sem montar o arquivo inteiro (nem uma cópia filtrada da base) em
+memória antes.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+## Linhas por bloco na exportação
+TAMANHO_BLOCO = 100_000
+
+## Formatos suportados: extensão e MIME type
+FORMATOS = {
+    'csv': {'extensao': 'csv', 'mime': 'text/csv'},
+    'parquet': {'extensao': 'parquet', 'mime': 'application/vnd.apache.parquet'}
+}
+
+
+def iterar_blocos(df, posicoes=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Percorre as linhas selecionadas da base em blocos.
+
+    Args:
+      df: DataFrame de origem (ex.: base compartilhada)
+      posicoes: Posições das linhas selecionadas (None = todas)
+      tamanho_bloco: Quantidade de linhas por bloco
+
+    Yields:
+      pd.DataFrame: Bloco com até tamanho_bloco linhas
+    """
+    if posicoes is None:
+        posicoes = np.arange(len(df))
+
+    for inicio in range(0, len(posicoes), tamanho_bloco):
+        yield df.iloc[posicoes[inicio:inicio + tamanho_bloco]]
+
+
+def gerar_csv(df, posicoes=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Gera o CSV em pedaços de bytes (cabeçalho só no primeiro bloco).
+
+    Yields:
+      bytes: Pedaço do CSV codificado em UTF-8
+    """
+    # Cabeçalho pelo próprio to_csv: nomes com vírgula ou aspas saem entre aspas, como os dados
+    yield df.iloc[:0].to_csv(index=False).encode('utf-8')
+
+    for bloco in iterar_blocos(df, posicoes, tamanho_bloco):
+        yield bloco.to_csv(index=False, header=False).encode('utf-8')
+
+
+def escrever_csv(df, destino, posicoes=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Escreve o CSV bloco a bloco em um arquivo binário aberto.
+    """
+    for pedaco in gerar_csv(df, posicoes, tamanho_bloco):
+        destino.write(pedaco)
+
+
+def escrever_parquet(df, destino, posicoes=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Escreve o Parquet com um row group por bloco em um arquivo binário aberto.
+    """
+    esquema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for bloco in iterar_blocos(df, posicoes, tamanho_bloco):
+            escritor.write_table(pa.Table.from_pandas(bloco, schema=esquema, preserve_index=False))
+
+
+def exportar(df, formato, destino, posicoes=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Exporta as linhas selecionadas no formato escolhido.
+
+    Args:
+      df: DataFrame de origem
+      formato: 'csv' ou 'parquet'
+      destino: Arquivo binário aberto para escrita
+      posicoes: Posições das linhas selecionadas (None = todas)
+      tamanho_bloco: Quantidade de linhas por bloco
+    """
+    if formato == 'csv':
+        escrever_csv(df, destino, posicoes, tamanho_bloco)
+    elif formato == 'parquet':
+        escrever_parquet(df, destino, posicoes, tamanho_bloco)
+    else:
+        raise ValueError(f"Formato não suportado: {formato}. Opções: {', '.join(FORMATOS)}")
+
+
+def exportar_temporario(df, formato, posicoes=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Exporta para um arquivo temporário em disco e o reabre para leitura.
+
+    O arquivo não tem nome no sistema de arquivos e é apagado quando o
+    leitor retornado é fechado (ou coletado).
+
+    Returns:
+      io.BufferedReader: Arquivo exportado, posicionado no início
+    """
+    with tempfile.TemporaryFile() as arquivo:
+        exportar(df, formato, arquivo, posicoes, tamanho_bloco)
+        arquivo.flush()
+        # Um descritor duplicado mantém o arquivo vivo depois do 'with'
+        leitor = open(os.dup(arquivo.fileno()), 'rb')
+
+    leitor.seek(0)
+    return leitor
@@ -3,133 +3,295 @@ Gerador de base de dados para análise de churn.
 
 Este script cria um CSV com dados fictícios de clientes,
 INCLUINDO datas de cadastro para permitir análises temporais.
+
+Os dados seguem um "cenário" escolhido pelo nome (ver CENARIOS), que define
+sazonalidade dos cadastros, deriva do churn no tempo, mix de contratos e
+cauda do total gasto. Toda a geração é vetorizada (NumPy + datetime64),
+o que permite criar milhões de linhas por segundo para testes de carga.
 """
 
+import time
+
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 
 np.random.seed(42)
 
 
-def gerar_data_cadastro(n_clientes, data_inicio='2024-01-01', data_fim='2025-12-31'):
+## Categorias geradas (a ordem é a mesma das probabilidades dos cenários)
+GENEROS = ['M', 'F']
+ASSINATURAS = ['Basico', 'Standard', 'Premium']
+CONTRATOS = ['Mensal', 'Trimestral', 'Anual']
+
+## Faixa de gasto (mínimo, máximo) de cada assinatura
+FAIXAS_GASTO = {
+    'Basico': (100, 500),
+    'Standard': (500, 2000),
+    'Premium': (2000, 10000)
+}
+
+## Cenários disponíveis
+# sazonalidade: amplitude da variação anual dos cadastros (0 = uniforme)
+# mes_pico: mês com mais cadastros quando há sazonalidade
+# crescimento: quanto os cadastros diários crescem do início ao fim (0.5 = +50%)
+# churn_base: probabilidade base de cancelar
+# deriva_churn: quanto a probabilidade de cancelar muda do início ao fim do período
+# efeito_contrato: ajuste na probabilidade de cancelar por tipo de contrato
+# mix_contratos: probabilidades de Mensal, Trimestral e Anual
+# mix_assinaturas: probabilidades de Basico, Standard e Premium
+# cauda_gasto: sigma do fator lognormal aplicado ao total gasto (0 = sem cauda)
+CENARIOS = {
+    'padrao': {
+        'descricao': "Base original: cadastros uniformes e regra de churn fixa",
+        'sazonalidade': 0.0,
+        'mes_pico': 1,
+        'crescimento': 0.0,
+        'churn_base': 0.2,
+        'deriva_churn': 0.0,
+        'efeito_contrato': [0.0, 0.0, 0.0],
+        'mix_contratos': [0.6, 0.25, 0.15],
+        'mix_assinaturas': [0.5, 0.35, 0.15],
+        'cauda_gasto': 0.0
+    },
+    'sazonal': {
+        'descricao': "Pico de cadastros no fim do ano (Black Friday/Natal)",
+        'sazonalidade': 0.6,
+        'mes_pico': 11,
+        'crescimento': 0.0,
+        'churn_base': 0.2,
+        'deriva_churn': 0.0,
+        'efeito_contrato': [0.05, 0.0, -0.05],
+        'mix_contratos': [0.6, 0.25, 0.15],
+        'mix_assinaturas': [0.5, 0.35, 0.15],
+        'cauda_gasto': 0.3
+    },
+    'deterioracao': {
+        'descricao': "Churn piorando ao longo do período",
+        'sazonalidade': 0.2,
+        'mes_pico': 3,
+        'crescimento': 0.3,
+        'churn_base': 0.12,
+        'deriva_churn': 0.2,
+        'efeito_contrato': [0.08, 0.0, -0.08],
+        'mix_contratos': [0.6, 0.25, 0.15],
+        'mix_assinaturas': [0.5, 0.35, 0.15],
+        'cauda_gasto': 0.5
+    },
+    'mensalistas': {
+        'descricao': "Base concentrada em contratos mensais",
+        'sazonalidade': 0.1,
+        'mes_pico': 1,
+        'crescimento': 0.0,
+        'churn_base': 0.22,
+        'deriva_churn': 0.0,
+        'efeito_contrato': [0.1, 0.0, -0.1],
+        'mix_contratos': [0.85, 0.1, 0.05],
+        'mix_assinaturas': [0.65, 0.3, 0.05],
+        'cauda_gasto': 0.3
+    },
+    'producao': {
+        'descricao': "Aproximação da produção: sazonal, em crescimento, com deriva e gasto de cauda longa",
+        'sazonalidade': 0.4,
+        'mes_pico': 11,
+        'crescimento': 0.8,
+        'churn_base': 0.15,
+        'deriva_churn': 0.08,
+        'efeito_contrato': [0.1, 0.0, -0.1],
+        'mix_contratos': [0.7, 0.2, 0.1],
+        'mix_assinaturas': [0.55, 0.33, 0.12],
+        'cauda_gasto': 0.9
+    }
+}
+
+
+def obter_cenario(nome):
+    """
+    Retorna a configuração de um cenário pelo nome.
+
+    Args:
+      nome: Nome do cenário (chave de CENARIOS)
+
+    Returns:
+      dict: Parâmetros do cenário
+    """
+    if nome not in CENARIOS:
+        raise ValueError(f"Cenário desconhecido: {nome}. Opções: {', '.join(CENARIOS)}")
+    return CENARIOS[nome]
+
+
+def gerar_data_cadastro(n_clientes, data_inicio='2024-01-01', data_fim='2025-12-31',
+                        sazonalidade=0.0, mes_pico=1, crescimento=0.0):
     """
     Gera datas aleatórias de cadastro para os clientes.
+
+    Cada dia do período recebe um peso (sazonalidade anual + tendência de
+    crescimento) e os dias são sorteados pela CDF acumulada desses pesos,
+    sem criar um objeto datetime por cliente.
+
+    Returns:
+      np.ndarray: Datas no formato datetime64[D]
     """
-    # Converter str para objetos datetime
-    inicio = pd.to_datetime(data_inicio)
-    fim = pd.to_datetime(data_fim)
+    inicio = np.datetime64(data_inicio, 'D')
+    fim = np.datetime64(data_fim, 'D')
 
     # Calcular quantos dias existem entre as datas
-    dias_diferenca = (fim - inicio).days
-
-    # Gerar números aleatórios de dias
-    dias_aleatorios = np.random.randint(0, dias_diferenca, size=n_clientes)
-
-    # Somar os dias à data inicial
-    datas = [inicio + timedelta(days=int(d)) for d in dias_aleatorios]
-
-    # Converter para string no formato YYYY-MM-DD
-    datas_formatadas = [d.strftime('%Y-%m-%d') for d in datas]
-
-    return datas_formatadas
-
-
-def gerar_base_churn(n_clientes=1000, caminho_saida='data/cancelamentos.csv'):
-        """
-        Gera base completa de dados com informações realistas.
-        """
-
-        print(f"🔄 Gerando base com {n_clientes} clientes...")
-
-        # IDs únicos
-        ids = range(1, n_clientes + 1)
-
-        datas_cadastro = gerar_data_cadastro(n_clientes)
-
-        # Dados demográficos
-        idades = np.random.randint(20, 65, n_clientes)
-        generos = np.random.choice(['M', 'F'], n_clientes)
-
-        # Dados de uso
-        tempo_cliente = np.random.randint(1, 60, n_clientes) # meses
-        frequencia_uso = np.random.randint(0, 50, n_clientes) # acessos/mês
-
-        # Dados de suporte
-        contatos_callcenter = np.random.choice([0, 1, 2, 3, 4, 5, 6, 7, 8],
-                                               n_clientes,
-                                               p=[0.3, 0.25, 0.2, 0.1, 0.08, 0.04, 0.02, 0.005, 0.005])
-        
-        # Dados financeiros
-        dias_atraso = np.random.choice([0, 5, 10, 15, 20, 30, 45, 60],
-                                       n_clientes,
-                                       p=[0.5, 0.15, 0.1, 0.1, 0.05, 0.05, 0.03, 0.02])
-        
-        assinaturas = np.random.choice(['Basico', 'Standard', 'Premium'],
-                                       n_clientes,
-                                       p=[0.5, 0.35, 0.15])
-        
-        contratos = np.random.choice(['Mensal', 'Trimestral', 'Anual'],
-                                     n_clientes,
-                                     p=[0.6, 0.25, 0.15])
-        
-        # Total gasto (correlacionado com tipo de assinatura)
-        total_gasto = []
-        for assinatura in assinaturas:
-            if assinatura == 'Basico':
-                gasto = np.random.uniform(100, 500)
-            elif assinatura == 'Standard':
-                gasto = np.random.uniform(500, 2000)
-            else:
-                gasto = np.random.uniform(2000, 10000)
-            total_gasto.append(round(gasto, 2))
-
-        # LÓGICA DE CANCELAMENTO (mais realista)
-        # Probabilidade base de cancelar: 20%
-        prob_cancelar = np.ones(n_clientes) * 0.2
-    
-        # Aumenta chance se tiver muito atraso
-        prob_cancelar += (dias_atraso / 60) * 0.5  # +50% se 60 dias de atraso
-    
-        # Aumenta chance se ligar muito pro call center
-        prob_cancelar += (contatos_callcenter / 10) * 0.3  # +30% se 10 ligações
-    
-        # Reduz chance se for cliente antigo
-        prob_cancelar -= (tempo_cliente / 60) * 0.15  # -15% se cliente há 5 anos
-    
-        # Garante que probabilidade fica entre 0 e 1
-        prob_cancelar = np.clip(prob_cancelar, 0, 1)
-    
-        # Gera cancelamentos baseado nas probabilidades
-        cancelados = np.random.binomial(1, prob_cancelar)
-    
-        # Criar DataFrame
-        df = pd.DataFrame({
-            'id_cliente': ids,
-            'data_cadastro': datas_cadastro,
-            'idade': idades,
-            'genero': generos,
-            'tempo_cliente': tempo_cliente,
-            'frequencia_uso': frequencia_uso,
-            'contatos_callcenter': contatos_callcenter,
-            'dias_atraso': dias_atraso,
-            'assinatura': assinaturas,
-            'duracao_contrato': contratos,
-            'total_gasto': total_gasto,
-            'cancelado': cancelados
-        })
-    
-        # Salvar CSV
+    dias = np.arange(inicio, fim, dtype='datetime64[D]')
+    n_dias = len(dias)
+
+    # Peso de cada dia: pico sazonal em mes_pico (cosseno anual) + tendência linear
+    dia_do_ano = (dias - dias.astype('datetime64[Y]')).astype(np.int64)
+    dia_pico = (mes_pico - 1) * 30.4 + 15
+    pesos = 1 + sazonalidade * np.cos(2 * np.pi * (dia_do_ano - dia_pico) / 365.25)
+    pesos *= 1 + crescimento * np.linspace(0, 1, n_dias)
+
+    # Sorteio pela CDF dos pesos
+    cdf = np.cumsum(pesos)
+    cdf /= cdf[-1]
+    indices = np.searchsorted(cdf, np.random.random(n_clientes), side='right')
+
+    return dias[np.minimum(indices, n_dias - 1)]
+
+
+def gerar_dados_cenario(n_clientes=1000, cenario='padrao',
+                        data_inicio='2024-01-01', data_fim='2025-12-31'):
+    """
+    Gera a base de clientes em memória segundo um cenário.
+
+    Args:
+      n_clientes: Quantidade de clientes
+      cenario: Nome do cenário (chave de CENARIOS)
+      data_inicio: Primeira data de cadastro possível
+      data_fim: Data limite (exclusiva) de cadastro
+
+    Returns:
+      pd.DataFrame: DataFrame no formato de COLUNAS_NECESSARIAS
+    """
+    config = obter_cenario(cenario)
+
+    # IDs únicos
+    ids = np.arange(1, n_clientes + 1)
+
+    datas_cadastro = gerar_data_cadastro(
+        n_clientes, data_inicio, data_fim,
+        sazonalidade=config['sazonalidade'],
+        mes_pico=config['mes_pico'],
+        crescimento=config['crescimento']
+    )
+
+    # Dados demográficos
+    idades = np.random.randint(20, 65, n_clientes)
+    generos = np.random.randint(0, len(GENEROS), n_clientes)
+
+    # Dados de uso
+    tempo_cliente = np.random.randint(1, 60, n_clientes) # meses
+    frequencia_uso = np.random.randint(0, 50, n_clientes) # acessos/mês
+
+    # Dados de suporte
+    contatos_callcenter = np.random.choice([0, 1, 2, 3, 4, 5, 6, 7, 8],
+                                           n_clientes,
+                                           p=[0.3, 0.25, 0.2, 0.1, 0.08, 0.04, 0.02, 0.005, 0.005])
+
+    # Dados financeiros
+    dias_atraso = np.random.choice([0, 5, 10, 15, 20, 30, 45, 60],
+                                   n_clientes,
+                                   p=[0.5, 0.15, 0.1, 0.1, 0.05, 0.05, 0.03, 0.02])
+
+    # Assinatura e contrato como códigos inteiros (viram categorias no DataFrame)
+    assinaturas = np.random.choice(len(ASSINATURAS), n_clientes, p=config['mix_assinaturas'])
+    contratos = np.random.choice(len(CONTRATOS), n_clientes, p=config['mix_contratos'])
+
+    # Total gasto (correlacionado com tipo de assinatura)
+    minimos = np.array([FAIXAS_GASTO[a][0] for a in ASSINATURAS], dtype=float)
+    maximos = np.array([FAIXAS_GASTO[a][1] for a in ASSINATURAS], dtype=float)
+    total_gasto = minimos[assinaturas] + np.random.random(n_clientes) * (maximos - minimos)[assinaturas]
+
+    # Cauda longa: fator lognormal com média 1, poucos clientes gastam muito mais
+    sigma = config['cauda_gasto']
+    if sigma > 0:
+        total_gasto *= np.random.lognormal(-sigma ** 2 / 2, sigma, n_clientes)
+    total_gasto = np.round(total_gasto, 2)
+
+    # LÓGICA DE CANCELAMENTO (mais realista)
+    # Probabilidade base de cancelar
+    prob_cancelar = np.full(n_clientes, config['churn_base'])
+
+    # Aumenta chance se tiver muito atraso
+    prob_cancelar += (dias_atraso / 60) * 0.5  # +50% se 60 dias de atraso
+
+    # Aumenta chance se ligar muito pro call center
+    prob_cancelar += (contatos_callcenter / 10) * 0.3  # +30% se 10 ligações
+
+    # Reduz chance se for cliente antigo
+    prob_cancelar -= (tempo_cliente / 60) * 0.15  # -15% se cliente há 5 anos
+
+    # Ajuste por tipo de contrato
+    prob_cancelar += np.asarray(config['efeito_contrato'])[contratos]
+
+    # Deriva: a chance de cancelar muda conforme a data de cadastro avança
+    if config['deriva_churn']:
+        inicio = np.datetime64(data_inicio, 'D')
+        total_dias = max((np.datetime64(data_fim, 'D') - inicio).astype(np.int64), 1)
+        progresso = (datas_cadastro - inicio).astype(np.int64) / total_dias
+        prob_cancelar += progresso * config['deriva_churn']
+
+    # Garante que probabilidade fica entre 0 e 1
+    prob_cancelar = np.clip(prob_cancelar, 0, 1)
+
+    # Gera cancelamentos baseado nas probabilidades
+    cancelados = (np.random.random(n_clientes) < prob_cancelar).astype(np.int64)
+
+    return pd.DataFrame({
+        'id_cliente': ids,
+        'data_cadastro': datas_cadastro,
+        'idade': idades,
+        'genero': pd.Categorical.from_codes(generos, GENEROS),
+        'tempo_cliente': tempo_cliente,
+        'frequencia_uso': frequencia_uso,
+        'contatos_callcenter': contatos_callcenter,
+        'dias_atraso': dias_atraso,
+        'assinatura': pd.Categorical.from_codes(assinaturas, ASSINATURAS),
+        'duracao_contrato': pd.Categorical.from_codes(contratos, CONTRATOS),
+        'total_gasto': total_gasto,
+        'cancelado': cancelados
+    })
+
+
+def gerar_base_churn(n_clientes=1000, caminho_saida='data/cancelamentos.csv', cenario='padrao'):
+    """
+    Gera base completa de dados com informações realistas.
+
+    Args:
+      n_clientes: Quantidade de clientes
+      caminho_saida: Caminho do CSV (None = não salva, só retorna o DataFrame)
+      cenario: Nome do cenário (chave de CENARIOS)
+
+    Returns:
+      pd.DataFrame: Base gerada
+    """
+    print(f"🔄 Gerando base com {n_clientes} clientes (cenário '{cenario}')...")
+
+    inicio = time.perf_counter()
+    df = gerar_dados_cenario(n_clientes, cenario)
+    duracao = time.perf_counter() - inicio
+
+    print(f"⚡ Geração em {duracao:.2f}s ({n_clientes / max(duracao, 1e-9):,.0f} linhas/s)")
+
+    # Salvar CSV
+    if caminho_saida is not None:
         df.to_csv(caminho_saida, index=False)
-    
-        print(f"✅ Base gerada com sucesso!")
         print(f"📁 Salvo em: {caminho_saida}")
-        print(f"📊 Total de clientes: {len(df)}")
-        print(f"📅 Período dos dados: {df['data_cadastro'].min()} até {df['data_cadastro'].max()}")
-    
-        return df
+
+    print(f"✅ Base gerada com sucesso!")
+    print(f"📊 Total de clientes: {len(df)}")
+    print(f"📅 Período dos dados: {df['data_cadastro'].min().date()} até {df['data_cadastro'].max().date()}")
+
+    return df
 
 
 if __name__ == "__main__":
-     # Executar quando rodar: gerador_base.py
-     gerar_base_churn(n_clientes=1000)
\ No newline at end of file
+     # Executar quando rodar: gerador_base.py [n_clientes] [cenario]
+     import sys
+
+     n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+     nome_cenario = sys.argv[2] if len(sys.argv) > 2 else 'padrao'
+     gerar_base_churn(n_clientes=n, cenario=nome_cenario)
@@ -0,0 +1,186 @@
+"""
+Gerenciador de várias bases de churn (uma por unidade de negócio).
+
+Cada arquivo CSV no diretório de dados é uma base. As bases usadas mais
+recentemente ficam residentes em memória (já preparadas e somente leitura)
+enquanto couberem no orçamento de memória. Quando o orçamento estoura, as
+bases usadas há mais tempo são removidas (LRU) e, quando pedidas de novo,
+são recarregadas da cópia binária em Parquet, bem mais rápida que o CSV.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from base_compartilhada import preparar_base, congelar_dataframe, memoria_dataframe
+
+logger = logging.getLogger(__name__)
+
+## Orçamento padrão de memória para as bases residentes (MB)
+MEMORIA_MAXIMA_PADRAO_MB = 512
+
+## Subpasta (dentro do diretório de dados) com as cópias em Parquet
+PASTA_CACHE = '.cache'
+
+
+class GerenciadorBases:
+    """
+    Mantém as bases mais usadas em memória dentro de um orçamento.
+
+    Pode ser compartilhado entre sessões: a lista LRU e os contadores são
+    protegidos por um lock, mantido só durante a contabilidade. A leitura do
+    CSV/Parquet acontece fora dele, com um lock por base (a mesma base nunca
+    é carregada duas vezes ao mesmo tempo e as demais seguem disponíveis).
+    """
+
+    def __init__(self, diretorio, memoria_maxima_mb=MEMORIA_MAXIMA_PADRAO_MB):
+        """
+        Args:
+          diretorio: Pasta com os arquivos CSV (um por base)
+          memoria_maxima_mb: Orçamento total de memória das bases residentes
+        """
+        self.diretorio = Path(diretorio)
+        self.memoria_maxima = int(memoria_maxima_mb * 1024 ** 2)
+
+        self._residentes = OrderedDict()  # nome -> (versao, df, bytes)
+        self._lock = threading.Lock()
+        self._travas_carga = {}  # nome -> lock da carga dessa base
+
+        self.acertos = 0
+        self.faltas = 0
+        self.remocoes = 0
+
+    def listar(self):
+        """
+        Lista as bases disponíveis (nome do CSV sem extensão).
+        """
+        return sorted(caminho.stem for caminho in self.diretorio.glob('*.csv'))
+
+    def caminho_csv(self, nome):
+        """
+        Caminho do CSV de uma base.
+        """
+        return self.diretorio / f"{nome}.csv"
+
+    def versao(self, nome):
+        """
+        Versão da base: data de modificação do CSV em nanossegundos.
+        """
+        return self.caminho_csv(nome).stat().st_mtime_ns
+
+    def obter(self, nome):
+        """
+        Retorna a base pronta para uso, carregando-a se necessário.
+
+        Args:
+          nome: Nome da base (ver listar)
+
+        Returns:
+          pd.DataFrame: Base somente leitura, ou None se o CSV não existir
+        """
+        if not self.caminho_csv(nome).exists():
+            return None
+
+        versao = self.versao(nome)
+
+        with self._lock:
+            df = self._buscar_residente(nome, versao)
+            if df is not None:
+                return df
+            trava = self._travas_carga.setdefault(nome, threading.Lock())
+
+        # Carga fora do lock geral: só quem pede a MESMA base espera por ela
+        with trava:
+            with self._lock:
+                # Outra sessão pode ter carregado a base enquanto esta esperava
+                df = self._buscar_residente(nome, versao)
+                if df is not None:
+                    return df
+                self.faltas += 1
+
+            df = self._carregar(nome, versao)
+            tamanho = memoria_dataframe(df)
+
+            with self._lock:
+                self._residentes.pop(nome, None)
+                self._liberar_espaco(tamanho)
+                self._residentes[nome] = (versao, df, tamanho)
+
+            return df
+
+    def _buscar_residente(self, nome, versao):
+        """
+        Retorna a base residente na versão pedida (ou None). Chamar com o lock.
+        """
+        residente = self._residentes.get(nome)
+        if residente is None or residente[0] != versao:
+            return None
+        self._residentes.move_to_end(nome)
+        self.acertos += 1
+        return residente[1]
+
+    def _carregar(self, nome, versao):
+        """
+        Carrega a base da cópia em Parquet (ou do CSV, criando a cópia).
+        """
+        caminho_parquet = self.diretorio / PASTA_CACHE / f"{nome}-{versao}.parquet"
+
+        if caminho_parquet.exists():
+            return congelar_dataframe(pd.read_parquet(caminho_parquet))
+
+        df = preparar_base(pd.read_csv(self.caminho_csv(nome)))
+
+        # Remove cópias de versões antigas e grava a atual. A cópia só acelera
+        # as próximas cargas: sem permissão ou sem espaço, segue com a base do CSV
+        try:
+            caminho_parquet.parent.mkdir(exist_ok=True)
+            for antigo in caminho_parquet.parent.glob(f"{nome}-*.parquet"):
+                antigo.unlink()
+            df.to_parquet(caminho_parquet, index=False)
+        except OSError as erro:
+            logger.warning("Não foi possível gravar a cópia em Parquet de '%s': %s", nome, erro)
+            try:
+                caminho_parquet.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+        return df
+
+    def _liberar_espaco(self, tamanho_novo):
+        """
+        Remove as bases usadas há mais tempo até a nova caber no orçamento.
+
+        A base pedida sempre fica residente, mesmo que sozinha passe do orçamento.
+        """
+        while self._residentes and self.memoria_residente() + tamanho_novo > self.memoria_maxima:
+            self._residentes.popitem(last=False)
+            self.remocoes += 1
+
+    def memoria_residente(self):
+        """
+        Memória ocupada pelas bases residentes, em bytes.
+        """
+        return sum(tamanho for _, _, tamanho in self._residentes.values())
+
+    def estatisticas(self):
+        """
+        Resumo do uso de memória e do cache.
+
+        Returns:
+          dict: Bases residentes (da mais antiga para a mais recente), memória e contadores
+        """
+        with self._lock:
+            return {
+                'residentes': [
+                    {'base': nome, 'memoria_mb': tamanho / 1024 ** 2}
+                    for nome, (_, _, tamanho) in self._residentes.items()
+                ],
+                'memoria_residente_mb': self.memoria_residente() / 1024 ** 2,
+                'memoria_maxima_mb': self.memoria_maxima / 1024 ** 2,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'remocoes': self.remocoes
+            }
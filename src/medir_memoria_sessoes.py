@@ -0,0 +1,151 @@
+"""
+Mede a memória extra por sessão do dashboard.
+
+Compara duas estratégias de carga da base:
+- 'copia': comportamento antigo (@st.cache_data + converter_coluna_data),
+  em que cada rerun recebe uma cópia desserializada e depois outra cópia
+  convertida da base
+- 'compartilhada': base carregada uma vez (@st.cache_resource + base
+  somente leitura), em que todos os reruns usam o mesmo objeto
+
+Nos dois modos cada sessão executa o caminho de filtros do app (máscara,
+df_filtrado = df[mascara] e posicoes_filtradas da exportação). A medida é a
+memória mantida por N reruns em andamento ao mesmo tempo (N usuários
+interagindo juntos): tudo o que um rerun aloca fica vivo até ele terminar.
+
+Uso:
+    python medir_memoria_sessoes.py [n_clientes]
+"""
+
+import gc
+import pickle
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from gerador_base import gerar_dados_cenario
+from base_compartilhada import preparar_base
+
+SESSOES_PADRAO = [1, 10, 50]
+
+## Filtros simulados: (nome, função que devolve data inicial, data final e contrato)
+FILTROS = {
+    # Abertura da página: período inteiro e todos os contratos (df_filtrado = base inteira)
+    'sem_filtro': lambda df: (df['data_cadastro'].min(), df['data_cadastro'].max(), 'Todos'),
+    # Recorte típico: contratos mensais dos últimos 365 dias
+    'mensal_ultimo_ano': lambda df: (
+        df['data_cadastro'].max() - pd.Timedelta(days=365), df['data_cadastro'].max(), 'Mensal'
+    )
+}
+
+
+def _aplicar_filtros(df, filtro):
+    """
+    Executa o caminho de filtros de um rerun do app (streamlit_app.py, seção I).
+
+    Returns:
+      tuple: Objetos que o rerun mantém vivos (máscara, df_filtrado, posições)
+    """
+    data_inicial, data_final, contrato = FILTROS[filtro](df)
+
+    mascara = (df['data_cadastro'] >= data_inicial) & (df['data_cadastro'] <= data_final)
+    if contrato != 'Todos':
+        mascara &= df['duracao_contrato'] == contrato
+
+    df_filtrado = df[mascara]
+    posicoes_filtradas = np.flatnonzero(mascara.to_numpy())
+    return mascara, df_filtrado, posicoes_filtradas
+
+
+def _rerun(cache, modo, filtro):
+    """
+    Simula um rerun de uma sessão e devolve o que ele mantém em memória.
+    """
+    if modo == 'copia':
+        # Modelo antigo: cada rerun desserializa e converte a base
+        df = pickle.loads(cache)
+        df = df.copy()
+        df['data_cadastro'] = pd.to_datetime(df['data_cadastro'], errors='coerce')
+        return (df,) + _aplicar_filtros(df, filtro)
+
+    return _aplicar_filtros(cache, filtro)
+
+
+def medir_memoria(df_csv, n_sessoes, modo, filtro='sem_filtro'):
+    """
+    Mede a memória mantida por n_sessoes reruns simultâneos.
+
+    Args:
+      df_csv: Base como lida do CSV (textos e datas como string)
+      n_sessoes: Quantidade de sessões simuladas
+      modo: 'copia' ou 'compartilhada'
+      filtro: Nome do filtro de FILTROS aplicado pelas sessões
+
+    Returns:
+      dict: Memória total (bytes), extra por sessão (bytes) e pico (bytes)
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    # Carga do processo (acontece uma vez, fica no cache)
+    if modo == 'copia':
+        cache = pickle.dumps(df_csv)
+    else:
+        cache = preparar_base(df_csv)
+    memoria_cache, _ = tracemalloc.get_traced_memory()
+
+    # Cada sessão mantém os objetos do seu rerun enquanto ele está em andamento
+    sessoes = [_rerun(cache, modo, filtro) for _ in range(n_sessoes)]
+
+    memoria_total, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del sessoes, cache
+    gc.collect()
+
+    return {
+        'total': memoria_total,
+        'por_sessao': (memoria_total - memoria_cache) / n_sessoes,
+        'pico': pico
+    }
+
+
+def gerar_relatorio(n_clientes=50000, lista_sessoes=None, filtros=None):
+    """
+    Gera a tabela comparando os dois modos para cada filtro e quantidade de sessões.
+
+    Returns:
+      pd.DataFrame: Uma linha por (modo, filtro, sessões) com memória em MB
+    """
+    lista_sessoes = lista_sessoes or SESSOES_PADRAO
+    filtros = filtros or list(FILTROS)
+
+    # Base no mesmo formato que o pd.read_csv devolve
+    df_csv = gerar_dados_cenario(n_clientes, 'producao')
+    df_csv['data_cadastro'] = df_csv['data_cadastro'].dt.strftime('%Y-%m-%d')
+    for nome in ['genero', 'assinatura', 'duracao_contrato']:
+        df_csv[nome] = df_csv[nome].astype(str)
+
+    linhas = []
+    for modo in ['copia', 'compartilhada']:
+        for filtro in filtros:
+            for n_sessoes in lista_sessoes:
+                resultado = medir_memoria(df_csv, n_sessoes, modo, filtro)
+                linhas.append({
+                    'modo': modo,
+                    'filtro': filtro,
+                    'sessoes': n_sessoes,
+                    'memoria_total_mb': resultado['total'] / 1024 ** 2,
+                    'extra_por_sessao_mb': resultado['por_sessao'] / 1024 ** 2,
+                    'pico_mb': resultado['pico'] / 1024 ** 2
+                })
+
+    return pd.DataFrame(linhas)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"📏 Memória por sessão ({n:,} clientes)")
+    print(gerar_relatorio(n).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
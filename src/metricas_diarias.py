@@ -0,0 +1,213 @@
+"""
+Métricas diárias acumuladas (somas de prefixo) para o dashboard.
+
+A base é resumida uma única vez em arrays acumulados por dia, no geral e
+por tipo de contrato. Com eles, qualquer intervalo data_inicial..data_final
+vira a diferença de duas posições do array, sem precisar filtrar ou
+reagrupar o DataFrame a cada interação.
+"""
+
+import numpy as np
+import pandas as pd
+
+## Nome do grupo que soma todos os contratos (mesmo valor usado no filtro do app)
+TODOS = 'Todos'
+
+## Janelas disponíveis para as tendências móveis (em dias)
+JANELAS_MOVEIS = [7, 30, 90]
+
+
+def _somar_prefixo(valores_por_dia):
+    """
+    Soma acumulada com um zero na frente: acumulado[i] = soma dos dias < i.
+    """
+    acumulado = np.zeros((valores_por_dia.shape[0], valores_por_dia.shape[1] + 1))
+    np.cumsum(valores_por_dia, axis=1, out=acumulado[:, 1:])
+    acumulado.flags.writeable = False
+    return acumulado
+
+
+def construir_acumulados(df):
+    """
+    Constrói os arrays diários acumulados de clientes, cancelamentos e
+    receita perdida (total_gasto dos cancelados).
+
+    A linha 0 de cada array é o total geral; as seguintes seguem a ordem
+    de 'contratos'. Os arrays são somente leitura para poderem ser
+    compartilhados entre sessões.
+
+    Args:
+      df: DataFrame com 'data_cadastro' já convertida para datetime
+
+    Returns:
+      dict: Dicionário com data inicial, nº de dias, grupos e arrays acumulados
+    """
+    datas = df['data_cadastro'].to_numpy(dtype='datetime64[D]')
+    validas = ~np.isnat(datas)
+
+    # Valores ausentes seguem calcular_metricas: 'cancelado' vazio não conta
+    # como cancelamento e 'total_gasto' vazio não soma na receita perdida
+    datas = datas[validas]
+    cancelado = (df['cancelado'].to_numpy()[validas] == 1).astype(float)
+    receita = np.where(cancelado == 1, np.nan_to_num(df['total_gasto'].to_numpy(dtype=float)[validas]), 0.0)
+    contrato_codigos, contratos = pd.factorize(df['duracao_contrato'].to_numpy()[validas], sort=True)
+
+    if len(datas) == 0:
+        inicio = np.datetime64('NaT', 'D')
+        n_dias = 0
+        dia = datas.astype(np.int64)
+    else:
+        inicio = datas.min()
+        n_dias = int((datas.max() - inicio).astype(np.int64)) + 1
+        dia = (datas - inicio).astype(np.int64)
+
+    # Uma única contagem por (contrato, dia); o total geral é a soma dos contratos.
+    # Clientes sem contrato ficam num grupo extra que só entra no total geral
+    n_contratos = len(contratos)
+    contrato_codigos = np.where(contrato_codigos < 0, n_contratos, contrato_codigos)
+    chave = contrato_codigos * n_dias + dia
+    tamanho = (n_contratos + 1) * n_dias
+
+    def por_grupo(pesos):
+        por_contrato = np.bincount(chave, weights=pesos, minlength=tamanho).reshape(n_contratos + 1, n_dias)
+        return np.vstack([por_contrato.sum(axis=0, keepdims=True), por_contrato[:n_contratos]])
+
+    return {
+        'inicio': inicio,
+        'n_dias': n_dias,
+        'grupos': [TODOS] + list(contratos),
+        'clientes': _somar_prefixo(por_grupo(None)),
+        'cancelados': _somar_prefixo(por_grupo(cancelado)),
+        'receita_perdida': _somar_prefixo(por_grupo(receita))
+    }
+
+
+def _posicao(acumulados, data):
+    """
+    Converte uma data em posição no array acumulado (limitada ao período).
+    """
+    if acumulados['n_dias'] == 0:
+        return 0
+    deslocamento = (np.datetime64(pd.Timestamp(data).date(), 'D') - acumulados['inicio']).astype(np.int64)
+    return int(np.clip(deslocamento, 0, acumulados['n_dias']))
+
+
+def _linha(acumulados, contrato):
+    """
+    Retorna a linha dos arrays correspondente ao contrato (None se não existir).
+    """
+    if contrato not in acumulados['grupos']:
+        return None
+    return acumulados['grupos'].index(contrato)
+
+
+def consultar_intervalo(acumulados, data_inicial, data_final, contrato=TODOS):
+    """
+    Calcula as métricas principais de um intervalo em tempo constante.
+
+    Args:
+      acumulados: Resultado de construir_acumulados
+      data_inicial: Primeiro dia do intervalo (inclusivo)
+      data_final: Último dia do intervalo (inclusivo)
+      contrato: Tipo de contrato ou 'Todos'
+
+    Returns:
+      dict: Mesmas chaves de calcular_metricas
+    """
+    linha = _linha(acumulados, contrato)
+    inicio = _posicao(acumulados, data_inicial)
+    fim = _posicao(acumulados, pd.Timestamp(data_final) + pd.Timedelta(days=1))
+
+    if linha is None or fim <= inicio:
+        return {'total': 0, 'cancelados': 0, 'taxa_churn': 0, 'receita_perdida': 0}
+
+    total = int(acumulados['clientes'][linha, fim] - acumulados['clientes'][linha, inicio])
+    cancelados = int(acumulados['cancelados'][linha, fim] - acumulados['cancelados'][linha, inicio])
+    receita_perdida = acumulados['receita_perdida'][linha, fim] - acumulados['receita_perdida'][linha, inicio]
+
+    return {
+        'total': total,
+        'cancelados': cancelados,
+        'taxa_churn': (cancelados / total * 100) if total > 0 else 0,
+        'receita_perdida': receita_perdida
+    }
+
+
+def agregar_por_mes(acumulados, data_inicial, data_final, contrato=TODOS):
+    """
+    Monta a tabela de evolução mensal a partir dos acumulados.
+
+    Meses sem clientes no intervalo são omitidos, como no agrupamento por mês.
+
+    Returns:
+      pd.DataFrame: Colunas 'mes', 'cancelados', 'total_clientes' e 'taxa_churn'
+    """
+    colunas = ['mes', 'cancelados', 'total_clientes', 'taxa_churn']
+    linha = _linha(acumulados, contrato)
+    inicio = _posicao(acumulados, data_inicial)
+    fim = _posicao(acumulados, pd.Timestamp(data_final) + pd.Timedelta(days=1))
+
+    if linha is None or fim <= inicio:
+        return pd.DataFrame(columns=colunas)
+
+    # Limites de cada mês convertidos em posições do array
+    primeiro_dia = acumulados['inicio'] + inicio
+    ultimo_dia = acumulados['inicio'] + fim - 1
+    meses = np.arange(primeiro_dia.astype('datetime64[M]'), ultimo_dia.astype('datetime64[M]') + 1)
+    limites = (meses.astype('datetime64[D]') - acumulados['inicio']).astype(np.int64)
+    limites = np.clip(np.append(limites, fim), inicio, fim)
+
+    clientes = np.diff(acumulados['clientes'][linha, limites])
+    cancelados = np.diff(acumulados['cancelados'][linha, limites])
+    com_dados = clientes > 0
+
+    tabela = pd.DataFrame({
+        'mes': meses[com_dados].astype(str),
+        'cancelados': cancelados[com_dados].astype(np.int64),
+        'total_clientes': clientes[com_dados].astype(np.int64)
+    })
+    tabela['taxa_churn'] = tabela['cancelados'] / tabela['total_clientes'] * 100
+
+    return tabela
+
+
+def calcular_tendencia_movel(acumulados, janela, data_inicial, data_final, contrato=TODOS):
+    """
+    Calcula a taxa de churn móvel e a média móvel de cancelamentos por dia.
+
+    Para cada dia, a janela cobre os 'janela' dias anteriores (incluindo o
+    próprio dia), sem ultrapassar a data inicial do filtro.
+
+    Args:
+      acumulados: Resultado de construir_acumulados
+      janela: Tamanho da janela em dias (ex.: 7, 30, 90)
+      data_inicial: Primeiro dia do intervalo (inclusivo)
+      data_final: Último dia do intervalo (inclusivo)
+      contrato: Tipo de contrato ou 'Todos'
+
+    Returns:
+      pd.DataFrame: Colunas 'data', 'janela', 'taxa_churn' e 'media_cancelamentos'
+    """
+    linha = _linha(acumulados, contrato)
+    inicio = _posicao(acumulados, data_inicial)
+    fim = _posicao(acumulados, pd.Timestamp(data_final) + pd.Timedelta(days=1))
+
+    if linha is None or fim <= inicio:
+        return pd.DataFrame(columns=['data', 'janela', 'taxa_churn', 'media_cancelamentos'])
+
+    # Dia t usa os acumulados de [t + 1 - janela, t + 1)
+    saida = np.arange(inicio + 1, fim + 1)
+    entrada = np.maximum(saida - janela, inicio)
+
+    clientes = acumulados['clientes'][linha, saida] - acumulados['clientes'][linha, entrada]
+    cancelados = acumulados['cancelados'][linha, saida] - acumulados['cancelados'][linha, entrada]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        taxa_churn = np.where(clientes > 0, cancelados / clientes * 100, np.nan)
+
+    return pd.DataFrame({
+        'data': acumulados['inicio'] + saida - 1,
+        'janela': f"{janela} dias",
+        'taxa_churn': taxa_churn,
+        'media_cancelamentos': cancelados / (saida - entrada)
+    })
@@ -0,0 +1,149 @@
+"""
+Navegador paginado dos dados brutos.
+
+Guarda, para uma versão da base, um índice ordenado de 'id_cliente' (busca
+binária) e as permutações de ordenação de cada coluna e sentido, calculadas na
+primeira vez em que são pedidas. Uma página é só um recorte dessas
+permutações: apenas as linhas da página viram DataFrame e vão para o
+navegador.
+
+O navegador guarda só os índices, nunca a base: a base é passada a cada
+chamada. Assim um navegador em cache não mantém viva uma base que o
+gerenciador de bases já removeu da memória.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+## Tamanhos de página oferecidos
+TAMANHOS_PAGINA = [10, 25, 50, 100]
+
+
+def _posicoes_compactas(posicoes, n_linhas):
+    """
+    Usa int32 para as posições quando a base cabe (metade da memória).
+    """
+    tipo = np.int32 if n_linhas < np.iinfo(np.int32).max else np.int64
+    posicoes = posicoes.astype(tipo, copy=False)
+    posicoes.flags.writeable = False
+    return posicoes
+
+
+def _chave_ordenacao(serie, crescente=True):
+    """
+    Postos usados para ordenar uma coluna (categorias em ordem alfabética).
+
+    Valores ausentes (NaN, NaT, None) recebem o maior posto nos dois
+    sentidos, para ficarem sempre no fim; valores iguais têm o mesmo posto.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categorias = np.asarray(serie.cat.categories.astype(str))
+        posto = np.empty(len(categorias), dtype=np.int64)
+        posto[np.argsort(categorias, kind='stable')] = np.arange(len(categorias))
+        codigos = serie.cat.codes.to_numpy()
+        postos = np.where(codigos >= 0, posto[codigos], -1)
+        n_distintos = len(categorias)
+    else:
+        # factorize ordena sem comparar os ausentes (argsort falha em object com NaN)
+        postos, distintos = pd.factorize(serie, sort=True)
+        n_distintos = len(distintos)
+
+    if not crescente:
+        postos = np.where(postos >= 0, n_distintos - 1 - postos, -1)
+    # Valores ausentes (-1) vão para o fim
+    return np.where(postos >= 0, postos, n_distintos)
+
+
+class NavegadorDados:
+    """
+    Índices de busca e ordenação de uma versão da base (somente leitura).
+
+    Pode ser compartilhado entre sessões: as ordenações são calculadas uma
+    vez por coluna, protegidas por um lock. Os métodos que leem a base a
+    recebem como argumento (deve ser a mesma versão usada na criação).
+    """
+
+    def __init__(self, df):
+        """
+        Args:
+          df: Base (compartilhada) com a coluna 'id_cliente' (não é guardada)
+        """
+        self.n_linhas = len(df)
+        ids = df['id_cliente'].to_numpy()
+
+        # Índice de id_cliente: posições em ordem de id + ids ordenados
+        self._ordem_ids = _posicoes_compactas(np.argsort(ids, kind='stable'), len(df))
+        self._ids_ordenados = ids[self._ordem_ids]
+        self._ids_ordenados.flags.writeable = False
+
+        self._ordens = {}
+        self._lock = threading.Lock()
+
+    def buscar_cliente(self, id_cliente):
+        """
+        Encontra as linhas de um cliente por busca binária no índice.
+
+        Args:
+          id_cliente: Id procurado
+
+        Returns:
+          np.ndarray: Posições (na base) das linhas com esse id
+        """
+        inicio = np.searchsorted(self._ids_ordenados, id_cliente, side='left')
+        fim = np.searchsorted(self._ids_ordenados, id_cliente, side='right')
+        return np.sort(self._ordem_ids[inicio:fim])
+
+    def _verificar_base(self, df):
+        """
+        Garante que df tem o tamanho da base usada para criar os índices.
+        """
+        if len(df) != self.n_linhas:
+            raise ValueError(
+                f"Base com {len(df)} linhas, mas o navegador foi criado para {self.n_linhas} linhas"
+            )
+
+    def ordem(self, df, coluna, crescente=True):
+        """
+        Permutação que ordena a base pela coluna (estável, ausentes no fim).
+        """
+        self._verificar_base(df)
+        with self._lock:
+            if (coluna, crescente) not in self._ordens:
+                chave = _chave_ordenacao(df[coluna], crescente)
+                self._ordens[coluna, crescente] = _posicoes_compactas(
+                    np.argsort(chave, kind='stable'), self.n_linhas
+                )
+            return self._ordens[coluna, crescente]
+
+    def pagina(self, df, mascara, numero, tamanho, coluna=None, crescente=True):
+        """
+        Monta uma página das linhas selecionadas.
+
+        Args:
+          df: Base (mesma versão usada para criar o navegador)
+          mascara: Array booleano das linhas selecionadas (filtros ativos)
+          numero: Número da página (começa em 1)
+          tamanho: Linhas por página
+          coluna: Coluna de ordenação (None = ordem original)
+          crescente: Ordem crescente (True) ou decrescente (False)
+
+        Returns:
+          tuple: (DataFrame da página, total de páginas, total de linhas)
+        """
+        self._verificar_base(df)
+        if coluna is None:
+            posicoes = np.flatnonzero(mascara)
+            if not crescente:
+                posicoes = posicoes[::-1]
+        else:
+            ordem = self.ordem(df, coluna, crescente)
+            posicoes = ordem[mascara[ordem]]
+
+        total = len(posicoes)
+        total_paginas = max(1, -(-total // tamanho))
+        numero = min(max(1, numero), total_paginas)
+        inicio = (numero - 1) * tamanho
+
+        return df.iloc[posicoes[inicio:inicio + tamanho]], total_paginas, total
@@ -0,0 +1,180 @@
+"""
+Descoberta dos segmentos de clientes com maior risco de churn.
+
+Um segmento é qualquer combinação de valores de até cinco dimensões
+(assinatura, contrato, gênero, faixa etária e faixa de atraso), como
+"Basico + Mensal" ou "55+ + 31+ dias de atraso". Cada dimensão é
+codificada como inteiro, a base é agregada UMA vez em um cubo com todas
+as combinações completas (np.bincount sobre a chave combinada) e os
+segmentos com menos dimensões saem somando o cubo nos eixos que ficam
+livres, sem groupby aninhado.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+## Valor exibido quando a dimensão não faz parte do segmento
+QUALQUER = '—'
+
+## Faixas etárias: limites inferiores e rótulos
+LIMITES_IDADE = [25, 35, 45, 55]
+FAIXAS_IDADE = ['<25', '25-34', '35-44', '45-54', '55+']
+
+## Faixas de atraso (dias): limites inferiores e rótulos
+LIMITES_ATRASO = [1, 16, 31]
+FAIXAS_ATRASO = ['Em dia', '1-15 dias', '16-30 dias', '31+ dias']
+
+## Dimensões dos segmentos, na ordem das colunas do resultado
+DIMENSOES = ['assinatura', 'duracao_contrato', 'genero', 'faixa_etaria', 'faixa_atraso']
+
+## Tamanho mínimo padrão de um segmento
+MINIMO_CLIENTES_PADRAO = 30
+
+
+def _codificar_categoria(serie):
+    """
+    Converte uma coluna de texto/categoria em (códigos inteiros, rótulos).
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy().astype(np.int64), list(serie.cat.categories)
+    codigos, rotulos = pd.factorize(serie, sort=True)
+    return codigos.astype(np.int64), list(rotulos)
+
+
+def _codificar_faixa(valores, limites):
+    """
+    Converte valores numéricos no índice da faixa (-1 para valores ausentes).
+    """
+    valores = np.asarray(valores, dtype=float)
+    codigos = np.digitize(valores, limites)
+    codigos[np.isnan(valores)] = -1
+    return codigos
+
+
+def codificar_dimensoes(df):
+    """
+    Codifica as dimensões dos segmentos como inteiros.
+
+    Args:
+      df: DataFrame com as colunas de COLUNAS_NECESSARIAS
+
+    Returns:
+      tuple: (lista de arrays de códigos, lista de listas de rótulos) na ordem de DIMENSOES
+    """
+    codigos = []
+    rotulos = []
+
+    for nome in ['assinatura', 'duracao_contrato', 'genero']:
+        codigos_dimensao, rotulos_dimensao = _codificar_categoria(df[nome])
+        codigos.append(codigos_dimensao)
+        rotulos.append(rotulos_dimensao)
+
+    codigos.append(_codificar_faixa(df['idade'], LIMITES_IDADE))
+    rotulos.append(FAIXAS_IDADE)
+
+    codigos.append(_codificar_faixa(df['dias_atraso'], LIMITES_ATRASO))
+    rotulos.append(FAIXAS_ATRASO)
+
+    return codigos, rotulos
+
+
+def calcular_segmentos(df):
+    """
+    Calcula clientes, cancelados, taxa de churn e receita perdida de TODOS os
+    segmentos (todas as combinações de valores de 1 a 5 dimensões).
+
+    Args:
+      df: DataFrame com as colunas de COLUNAS_NECESSARIAS
+
+    Returns:
+      pd.DataFrame: Uma linha por segmento com as colunas de DIMENSOES
+      (QUALQUER quando a dimensão não entra no segmento), 'n_dimensoes',
+      'clientes', 'cancelados', 'taxa_churn' e 'receita_perdida'
+    """
+    codigos, rotulos = codificar_dimensoes(df)
+    formato = tuple(len(r) for r in rotulos)
+
+    # Linhas com alguma dimensão ausente ficam de fora
+    validas = np.logical_and.reduce([c >= 0 for c in codigos])
+    codigos = [c[validas] for c in codigos]
+    # Valores ausentes como em calcular_metricas: 'cancelado' vazio não é
+    # cancelamento e 'total_gasto' vazio não soma na receita perdida
+    cancelado = (df['cancelado'].to_numpy()[validas] == 1).astype(float)
+    receita = np.where(cancelado == 1, np.nan_to_num(df['total_gasto'].to_numpy(dtype=float)[validas]), 0.0)
+
+    # Uma única agregação: chave combinada de todas as dimensões -> cubo
+    chave = np.ravel_multi_index(codigos, formato) if formato else np.zeros(0, dtype=np.int64)
+    tamanho = int(np.prod(formato))
+    cubos = {
+        'clientes': np.bincount(chave, minlength=tamanho).reshape(formato),
+        'cancelados': np.bincount(chave, weights=cancelado, minlength=tamanho).reshape(formato),
+        'receita_perdida': np.bincount(chave, weights=receita, minlength=tamanho).reshape(formato)
+    }
+
+    # Segmentos com k dimensões = soma do cubo nos eixos das outras dimensões
+    partes = []
+    eixos = range(len(DIMENSOES))
+    for k in range(1, len(DIMENSOES) + 1):
+        for usados in combinations(eixos, k):
+            livres = tuple(e for e in eixos if e not in usados)
+            parte = {
+                metrica: cubo.sum(axis=livres).ravel()
+                for metrica, cubo in cubos.items()
+            }
+            indices = np.unravel_index(np.arange(parte['clientes'].size), tuple(formato[e] for e in usados))
+            for eixo in eixos:
+                parte[DIMENSOES[eixo]] = indices[usados.index(eixo)] if eixo in usados else np.full(parte['clientes'].size, -1)
+            parte['n_dimensoes'] = np.full(parte['clientes'].size, k)
+            partes.append(parte)
+
+    colunas = DIMENSOES + ['n_dimensoes', 'clientes', 'cancelados', 'receita_perdida']
+    segmentos = pd.DataFrame({
+        coluna: np.concatenate([parte[coluna] for parte in partes]) for coluna in colunas
+    })
+    segmentos = segmentos[segmentos['clientes'] > 0].reset_index(drop=True)
+
+    # Códigos -> rótulos (-1 = dimensão livre)
+    for eixo, nome in enumerate(DIMENSOES):
+        opcoes = np.array([QUALQUER] + [str(r) for r in rotulos[eixo]], dtype=object)
+        segmentos[nome] = opcoes[segmentos[nome].to_numpy() + 1]
+
+    segmentos['cancelados'] = segmentos['cancelados'].astype(np.int64)
+    segmentos['taxa_churn'] = segmentos['cancelados'] / segmentos['clientes'] * 100
+
+    return segmentos
+
+
+def ranquear_segmentos(segmentos, minimo_clientes=MINIMO_CLIENTES_PADRAO, ordenar_por='taxa_churn', limite=None):
+    """
+    Filtra os segmentos pelo tamanho mínimo e ordena pelo risco.
+
+    Args:
+      segmentos: Resultado de calcular_segmentos
+      minimo_clientes: Menor quantidade de clientes de um segmento
+      ordenar_por: 'taxa_churn' ou 'receita_perdida' (a outra desempata)
+      limite: Quantidade máxima de segmentos retornados (None = todos)
+
+    Returns:
+      pd.DataFrame: Segmentos ordenados do maior para o menor risco
+    """
+    criterios = ['taxa_churn', 'receita_perdida']
+    if ordenar_por not in criterios:
+        raise ValueError(f"Critério inválido: {ordenar_por}. Opções: {', '.join(criterios)}")
+    criterios.remove(ordenar_por)
+
+    ranking = segmentos[segmentos['clientes'] >= minimo_clientes]
+    ranking = ranking.sort_values([ordenar_por] + criterios, ascending=False)
+
+    if limite is not None:
+        ranking = ranking.head(limite)
+
+    return ranking.reset_index(drop=True)
+
+
+def descrever_segmento(segmento):
+    """
+    Monta um texto curto do segmento, ex.: 'Basico · Mensal · 31+ dias'.
+    """
+    return ' · '.join(str(segmento[nome]) for nome in DIMENSOES if segmento[nome] != QUALQUER)
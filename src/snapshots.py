@@ -0,0 +1,247 @@
+"""
+Snapshots versionados da base e comparação entre versões.
+
+Cada versão do CSV (ex.: o export diário) vira um snapshot compacto em
+Parquet: 'id_cliente', as colunas-chave e um hash por linha de TODAS as
+colunas. Comparar duas versões é um join vetorizado por 'id_cliente'
+(ids ordenados + np.intersect1d), que aponta novos cancelamentos,
+reativações, campos alterados, clientes novos e removidos.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+## Colunas guardadas no snapshot além do id (permitem dizer QUAL campo mudou)
+COLUNAS_CHAVE = ['cancelado', 'assinatura', 'duracao_contrato', 'dias_atraso', 'total_gasto']
+
+## Colunas de data (o hash usa sempre datetime64[ns], venham como texto ou data)
+COLUNAS_DATA = ['data_cadastro']
+
+## Quantos snapshots manter por base
+MAXIMO_SNAPSHOTS = 30
+
+## Rótulo usado quando só colunas fora de COLUNAS_CHAVE mudaram
+OUTROS_CAMPOS = 'outros campos'
+
+## Estados do fluxo de churn entre versões
+ESTADO_NOVO = 'Novo cliente'
+ESTADO_REMOVIDO = 'Removido'
+ESTADO_ATIVO = 'Ativo'
+ESTADO_CANCELADO = 'Cancelado'
+ESTADO_DESCONHECIDO = 'Sem status'
+
+
+def _normalizar_tipos(df):
+    """
+    Converte as colunas para tipos fixos antes do hash da linha.
+
+    O hash depende do tipo: um NaN em 'cancelado' deixa a coluna float64 e,
+    sem isso, todas as linhas mudariam de hash entre versões.
+    'cancelado' vira Int8, outros números float64, datas datetime64[ns] e
+    textos/categorias string.
+    """
+    colunas = {}
+    for nome, serie in df.items():
+        if nome == 'cancelado':
+            colunas[nome] = pd.to_numeric(serie, errors='coerce').astype('Int8')
+        elif nome in COLUNAS_DATA or pd.api.types.is_datetime64_any_dtype(serie):
+            colunas[nome] = pd.to_datetime(serie, errors='coerce').astype('datetime64[ns]')
+        elif pd.api.types.is_numeric_dtype(serie):
+            colunas[nome] = serie.astype('float64')
+        else:
+            colunas[nome] = serie.astype('string')
+    return pd.DataFrame(colunas, index=df.index)
+
+
+def criar_snapshot(df):
+    """
+    Monta o snapshot compacto de uma base.
+
+    Args:
+      df: Base com as colunas de COLUNAS_NECESSARIAS
+
+    Returns:
+      pd.DataFrame: 'id_cliente', COLUNAS_CHAVE e 'hash_linha', ordenado por id
+      ('cancelado' como Int8, com <NA> quando o valor falta no CSV)
+    """
+    # Ids repetidos: vale a última ocorrência
+    df = df.drop_duplicates('id_cliente', keep='last')
+
+    # Textos como categoria e inteiros pequenos para o snapshot ficar compacto
+    # ('Int8' aceita valores ausentes de 'cancelado')
+    snapshot = df[['id_cliente'] + COLUNAS_CHAVE].reset_index(drop=True)
+    snapshot = snapshot.astype({'cancelado': 'Int8', 'assinatura': 'category', 'duracao_contrato': 'category'})
+    snapshot['hash_linha'] = pd.util.hash_pandas_object(
+        _normalizar_tipos(df.drop(columns=['id_cliente'])), index=False
+    ).to_numpy()
+
+    return snapshot.sort_values('id_cliente', kind='stable').reset_index(drop=True)
+
+
+def pasta_snapshots(diretorio, nome):
+    """
+    Pasta com os snapshots de uma base.
+    """
+    return Path(diretorio) / nome
+
+
+def salvar_snapshot(df, diretorio, nome, versao):
+    """
+    Salva o snapshot de uma versão (se ainda não existir) e apaga os mais antigos.
+
+    Args:
+      df: Base da versão
+      diretorio: Pasta raiz dos snapshots
+      nome: Nome da base
+      versao: Versão da base (inteiro crescente, ex.: mtime em ns)
+
+    Returns:
+      Path: Caminho do snapshot
+    """
+    pasta = pasta_snapshots(diretorio, nome)
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminho = pasta / f"{versao}.parquet"
+
+    if not caminho.exists():
+        # Grava em arquivo temporário e renomeia: leitores nunca veem arquivo pela metade
+        temporario = caminho.with_suffix('.tmp')
+        criar_snapshot(df).to_parquet(temporario, index=False)
+        temporario.replace(caminho)
+
+    for antigo in listar_snapshots(diretorio, nome)[:-MAXIMO_SNAPSHOTS]:
+        (pasta / f"{antigo}.parquet").unlink(missing_ok=True)
+
+    return caminho
+
+
+def listar_snapshots(diretorio, nome):
+    """
+    Lista as versões com snapshot, da mais antiga para a mais recente.
+    """
+    pasta = pasta_snapshots(diretorio, nome)
+    return sorted(int(caminho.stem) for caminho in pasta.glob('*.parquet') if caminho.stem.isdigit())
+
+
+def carregar_snapshot(diretorio, nome, versao):
+    """
+    Lê o snapshot de uma versão.
+    """
+    return pd.read_parquet(pasta_snapshots(diretorio, nome) / f"{versao}.parquet")
+
+
+def descrever_versao(versao):
+    """
+    Texto da versão para exibição (data/hora de modificação do CSV).
+    """
+    return pd.Timestamp(versao, unit='ns').strftime('%d/%m/%Y %H:%M:%S')
+
+
+def _valores(serie):
+    """
+    Valores de uma coluna do snapshot como array NumPy (<NA> de inteiros vira NaN).
+    """
+    if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype) and serie.dtype.kind in 'iu':
+        return serie.to_numpy(dtype=float, na_value=np.nan)
+    return serie.to_numpy()
+
+
+def _estados(cancelado):
+    """
+    Estado (ativo, cancelado ou sem status) de cada valor de 'cancelado'.
+    """
+    estados = np.full(len(cancelado), ESTADO_DESCONHECIDO, dtype=object)
+    estados[cancelado == 0] = ESTADO_ATIVO
+    estados[cancelado == 1] = ESTADO_CANCELADO
+    return estados
+
+
+def _descrever_campos(alterados_por_coluna):
+    """
+    Texto com os campos alterados de cada linha (ex.: 'cancelado, total_gasto').
+
+    As combinações viram um código de bits; cada código distinto é descrito uma vez.
+    """
+    codigos = np.zeros(len(alterados_por_coluna[0]), dtype=np.int64)
+    for bit, alterada in enumerate(alterados_por_coluna):
+        codigos |= alterada.astype(np.int64) << bit
+
+    textos = {}
+    for codigo in np.unique(codigos):
+        campos = [coluna for bit, coluna in enumerate(COLUNAS_CHAVE) if codigo >> bit & 1]
+        textos[codigo] = ', '.join(campos) if campos else OUTROS_CAMPOS
+
+    return pd.Series(codigos).map(textos).to_numpy()
+
+
+def comparar_snapshots(antigo, novo):
+    """
+    Compara duas versões da base pelo 'id_cliente'.
+
+    Args:
+      antigo: Snapshot da versão anterior (criar_snapshot)
+      novo: Snapshot da versão posterior (criar_snapshot)
+
+    Returns:
+      dict: DataFrames 'novos_cancelados', 'reativacoes', 'alterados',
+      'novos_clientes' e 'removidos' (valores da versão nova, exceto removidos),
+      além de 'fluxo' (origem, destino, clientes) para o gráfico
+    """
+    ids_antigos = antigo['id_cliente'].to_numpy()
+    ids_novos = novo['id_cliente'].to_numpy()
+
+    # Join vetorizado: ids únicos e ordenados nos dois snapshots
+    _, pos_antigo, pos_novo = np.intersect1d(ids_antigos, ids_novos, assume_unique=True, return_indices=True)
+
+    so_antigo = np.ones(len(antigo), dtype=bool)
+    so_antigo[pos_antigo] = False
+    so_novo = np.ones(len(novo), dtype=bool)
+    so_novo[pos_novo] = False
+
+    # 'cancelado' como float: valores ausentes viram NaN e não contam como mudança de status
+    cancelado_antigo = _valores(antigo['cancelado'])
+    cancelado_novo = _valores(novo['cancelado'])
+    cancelado_antes = cancelado_antigo[pos_antigo]
+    cancelado_depois = cancelado_novo[pos_novo]
+
+    novo_cancelamento = (cancelado_antes == 0) & (cancelado_depois == 1)
+    reativacao = (cancelado_antes == 1) & (cancelado_depois == 0)
+    hash_diferente = antigo['hash_linha'].to_numpy()[pos_antigo] != novo['hash_linha'].to_numpy()[pos_novo]
+
+    # Colunas-chave alteradas (só nas linhas com hash diferente)
+    linhas_alteradas = np.flatnonzero(hash_diferente)
+    alterados_por_coluna = []
+    for coluna in COLUNAS_CHAVE:
+        antes = _valores(antigo[coluna].iloc[pos_antigo[linhas_alteradas]])
+        depois = _valores(novo[coluna].iloc[pos_novo[linhas_alteradas]])
+        alterados_por_coluna.append(~((antes == depois) | (pd.isna(antes) & pd.isna(depois))))
+
+    alterados = novo.iloc[pos_novo[linhas_alteradas]].drop(columns=['hash_linha']).reset_index(drop=True)
+    alterados.insert(1, 'campos_alterados', _descrever_campos(alterados_por_coluna))
+
+    # Fluxo entre estados: ativo/cancelado/sem status antes -> depois
+    fluxo = pd.DataFrame({
+        'origem': _estados(cancelado_antes),
+        'destino': _estados(cancelado_depois)
+    }).value_counts().rename('clientes').reset_index()
+
+    entradas = pd.Series(_estados(cancelado_novo[so_novo])).value_counts()
+    saidas = pd.Series(_estados(cancelado_antigo[so_antigo])).value_counts()
+    fluxo = pd.concat([
+        fluxo,
+        pd.DataFrame({'origem': ESTADO_NOVO, 'destino': entradas.index, 'clientes': entradas.to_numpy()}),
+        pd.DataFrame({'origem': saidas.index, 'destino': ESTADO_REMOVIDO, 'clientes': saidas.to_numpy()})
+    ], ignore_index=True)
+
+    def linhas(snapshot, posicoes):
+        return snapshot.iloc[posicoes].drop(columns=['hash_linha']).reset_index(drop=True)
+
+    return {
+        'novos_cancelados': linhas(novo, pos_novo[novo_cancelamento]),
+        'reativacoes': linhas(novo, pos_novo[reativacao]),
+        'alterados': alterados,
+        'novos_clientes': linhas(novo, np.flatnonzero(so_novo)),
+        'removidos': linhas(antigo, np.flatnonzero(so_antigo)),
+        'fluxo': fluxo
+    }
@@ -0,0 +1,416 @@
+"""
+Teste de carga do dashboard com várias sessões simultâneas.
+
+Gera uma base do tamanho escolhido (gerador_base), sobe UM servidor real
+(`streamlit run`) apontado para ela e conecta N clientes ao mesmo tempo pelo
+WebSocket do Streamlit, o mesmo canal usado pelo navegador. Cada cliente
+abre a página e faz reruns trocando período e contrato; os reruns das
+sessões se sobrepõem no servidor e disputam os mesmos caches, como em
+produção.
+
+A carga é repetida para vários níveis de concorrência (ex.: 1, 5, 10 e 20
+sessões) e o relatório mostra, por nível, latência dos reruns
+(p50/p95/p99), vazão, quantos reruns rodaram ao mesmo tempo e a memória
+(RSS) do servidor, evidenciando como a latência cresce com os usuários.
+Com --p95-max o script termina com erro se o p95 de algum nível passar do
+limite, para pegar regressões de capacidade antes do deploy.
+
+Uso:
+    python teste_carga.py --sessoes 1 5 10 20 --reruns 10 --clientes 500000 --cenario producao
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from gerador_base import gerar_dados_cenario, CENARIOS, CONTRATOS
+
+## Caminho do app testado
+CAMINHO_APP = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+## Período das bases geradas (mesmo padrão do gerador)
+DATA_INICIO = date(2024, 1, 1)
+DATA_FIM = date(2025, 12, 30)
+
+## Níveis de concorrência padrão (sessões simultâneas)
+NIVEIS_PADRAO = [1, 5, 10, 20]
+
+## Tempo máximo para o servidor subir (s)
+TEMPO_LIMITE_SERVIDOR = 60
+
+## Tempo máximo de um rerun antes de considerar erro (s)
+TEMPO_LIMITE_RERUN = 300
+
+## Tamanho máximo de uma mensagem do servidor (bytes)
+TAMANHO_MAXIMO_MENSAGEM = 256 * 1024 ** 2
+
+## Formato das datas nos widgets de data do Streamlit
+FORMATO_DATA_WIDGET = '%Y/%m/%d'
+
+
+def _porta_livre():
+    """
+    Pede ao sistema uma porta TCP livre.
+    """
+    with socket.socket() as conexao:
+        conexao.bind(('127.0.0.1', 0))
+        return conexao.getsockname()[1]
+
+
+def memoria_servidor_mb(pid):
+    """
+    Memória residente (RSS) atual e de pico do processo do servidor, em MB.
+
+    Lida de /proc (Linux); em outros sistemas devolve NaN.
+    """
+    try:
+        linhas = Path(f"/proc/{pid}/status").read_text().splitlines()
+    except OSError:
+        return np.nan, np.nan
+    campos = dict(linha.split(':', 1) for linha in linhas if ':' in linha)
+    return int(campos['VmRSS'].split()[0]) / 1024, int(campos['VmHWM'].split()[0]) / 1024
+
+
+def iniciar_servidor(diretorio, porta):
+    """
+    Sobe o dashboard com `streamlit run` lendo as bases de diretorio.
+
+    Returns:
+      subprocess.Popen: Processo do servidor (já respondendo)
+    """
+    ambiente = dict(os.environ, CHURN_DIR_DADOS=str(diretorio))
+    log = open(Path(diretorio) / "servidor.log", 'wb')
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', str(CAMINHO_APP),
+         '--server.headless', 'true',
+         '--server.address', '127.0.0.1',
+         '--server.port', str(porta),
+         '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        env=ambiente, stdout=log, stderr=subprocess.STDOUT
+    )
+    log.close()
+
+    limite = time.monotonic() + TEMPO_LIMITE_SERVIDOR
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            break
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1):
+                return processo
+        except OSError:
+            time.sleep(0.2)
+
+    parar_servidor(processo)
+    saida = (Path(diretorio) / "servidor.log").read_text(errors='replace')[-2000:]
+    raise RuntimeError(f"O servidor Streamlit não subiu:\n{saida}")
+
+
+def parar_servidor(processo):
+    """
+    Encerra o servidor (e espera o processo terminar).
+    """
+    processo.terminate()
+    try:
+        processo.wait(10)
+    except subprocess.TimeoutExpired:
+        processo.kill()
+        processo.wait()
+
+
+class SessaoCliente:
+    """
+    Um usuário conectado ao servidor pelo WebSocket do Streamlit.
+
+    Guarda os ids dos widgets (pelo rótulo) vistos no último rerun e os
+    valores escolhidos, enviados a cada novo rerun como faz o navegador.
+    """
+
+    def __init__(self, url):
+        """
+        Args:
+          url: Endereço do WebSocket (ws://host:porta/_stcore/stream)
+        """
+        self.url = url
+        self.widgets = {}  # rótulo -> id do widget
+        self.estados = {}  # id do widget -> WidgetState
+        self._conexao = None
+
+    async def conectar(self):
+        self._conexao = await websocket_connect(self.url, max_message_size=TAMANHO_MAXIMO_MENSAGEM)
+
+    def fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+
+    def definir_data(self, rotulo, valor):
+        """
+        Escolhe a data de um st.date_input.
+        """
+        estado = WidgetState(id=self.widgets[rotulo])
+        estado.string_array_value.data.append(valor.strftime(FORMATO_DATA_WIDGET))
+        self.estados[estado.id] = estado
+
+    def definir_opcao(self, rotulo, opcao):
+        """
+        Escolhe a opção de um st.selectbox.
+        """
+        estado = WidgetState(id=self.widgets[rotulo], string_value=opcao)
+        self.estados[estado.id] = estado
+
+    async def rerun(self):
+        """
+        Pede um rerun com os valores atuais dos widgets e espera o fim do script.
+
+        Returns:
+          tuple: (latência em s, lista de erros exibidos pelo app)
+        """
+        mensagem = BackMsg()
+        mensagem.rerun_script.query_string = ''
+        mensagem.rerun_script.page_script_hash = ''
+        mensagem.rerun_script.widget_states.widgets.extend(self.estados.values())
+
+        inicio = time.perf_counter()
+        await self._conexao.write_message(mensagem.SerializeToString(), binary=True)
+
+        erros = []
+        while True:
+            bruta = await asyncio.wait_for(self._conexao.read_message(), TEMPO_LIMITE_RERUN)
+            if bruta is None:
+                raise ConnectionError("O servidor fechou a conexão")
+
+            resposta = ForwardMsg()
+            resposta.ParseFromString(bruta)
+            tipo = resposta.WhichOneof('type')
+
+            if tipo == 'delta' and resposta.delta.WhichOneof('type') == 'new_element':
+                elemento = resposta.delta.new_element
+                tipo_elemento = elemento.WhichOneof('type')
+                if tipo_elemento == 'exception':
+                    erros.append(elemento.exception.message)
+                else:
+                    # Widgets: elementos com id e rótulo
+                    widget = getattr(elemento, tipo_elemento)
+                    campos = widget.DESCRIPTOR.fields_by_name
+                    if 'id' in campos and 'label' in campos:
+                        self.widgets[widget.label] = widget.id
+            elif tipo == 'script_finished':
+                if resposta.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    erros.append("Erro de compilação do app")
+                return time.perf_counter() - inicio, erros
+
+
+def _acao_aleatoria(sessao, rng):
+    """
+    Aplica uma interação de usuário: muda o período e/ou o contrato.
+    """
+    if rng.random() < 0.7:
+        total_dias = (DATA_FIM - DATA_INICIO).days
+        inicio = rng.randint(0, total_dias - 1)
+        fim = rng.randint(inicio, total_dias)
+        sessao.definir_data("📅 Data Inicial", DATA_INICIO + timedelta(days=inicio))
+        sessao.definir_data("📅 Data Final", DATA_INICIO + timedelta(days=fim))
+    else:
+        sessao.definir_opcao("📋 Tipo de Contrato", rng.choice(['Todos'] + CONTRATOS))
+
+
+async def _executar_nivel(url, n_sessoes, n_reruns, semente):
+    """
+    Conecta n_sessoes clientes ao mesmo tempo; cada um abre a página e faz n_reruns reruns.
+
+    Returns:
+      dict: Latências da abertura e dos reruns (s), erros, duração (s) e
+      maior quantidade de reruns em andamento ao mesmo tempo
+    """
+    abertura = []
+    latencias = []
+    erros = []
+    em_andamento = {'atual': 0, 'maximo': 0}
+
+    async def medir(sessao, destino):
+        em_andamento['atual'] += 1
+        em_andamento['maximo'] = max(em_andamento['maximo'], em_andamento['atual'])
+        try:
+            latencia, erros_rerun = await sessao.rerun()
+        finally:
+            em_andamento['atual'] -= 1
+        destino.append(latencia)
+        erros.extend(erros_rerun)
+
+    async def usuario(indice):
+        rng = random.Random(semente * 1000 + indice)
+        sessao = SessaoCliente(url)
+        try:
+            await sessao.conectar()
+            await medir(sessao, abertura)
+            for _ in range(n_reruns):
+                _acao_aleatoria(sessao, rng)
+                await medir(sessao, latencias)
+        except Exception as erro:
+            erros.append(repr(erro))
+        finally:
+            sessao.fechar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(usuario(indice) for indice in range(n_sessoes)))
+
+    return {
+        'abertura': abertura,
+        'latencias': latencias,
+        'erros': erros,
+        'duracao': time.perf_counter() - inicio,
+        'simultaneos_max': em_andamento['maximo']
+    }
+
+
+def _resumir_nivel(n_sessoes, resultado, rss):
+    """
+    Percentis (ms), vazão e memória de um nível de concorrência.
+    """
+    latencias = np.array(resultado['latencias']) * 1000
+    abertura = np.array(resultado['abertura']) * 1000
+    percentis = np.percentile(latencias, [50, 95, 99]) if len(latencias) else [np.nan] * 3
+
+    return {
+        'sessoes': n_sessoes,
+        'abertura_p50_ms': float(np.median(abertura)) if len(abertura) else np.nan,
+        'abertura_max_ms': float(abertura.max()) if len(abertura) else np.nan,
+        'rerun_p50_ms': float(percentis[0]),
+        'rerun_p95_ms': float(percentis[1]),
+        'rerun_p99_ms': float(percentis[2]),
+        'rerun_max_ms': float(latencias.max()) if len(latencias) else np.nan,
+        'vazao_reruns_s': len(latencias) / resultado['duracao'] if resultado['duracao'] > 0 else np.nan,
+        'reruns_simultaneos_max': resultado['simultaneos_max'],
+        'rss_servidor_mb': round(rss[0], 1),
+        'rss_pico_servidor_mb': round(rss[1], 1),
+        'erros': len(resultado['erros']),
+        'exemplos_erros': resultado['erros'][:3]
+    }
+
+
+def executar_carga(niveis=None, n_reruns=5, n_clientes=100000, cenario='producao', semente=0):
+    """
+    Gera a base, sobe o servidor e roda a carga em cada nível de concorrência.
+
+    Antes dos níveis, uma sessão abre a página com o servidor frio (carga da
+    base e dos caches); os níveis medem o servidor já aquecido.
+
+    Args:
+      niveis: Quantidades de sessões simultâneas (ex.: [1, 5, 10, 20])
+      n_reruns: Interações (reruns) por sessão
+      n_clientes: Tamanho da base gerada
+      cenario: Cenário do gerador
+      semente: Semente da base e das interações
+
+    Returns:
+      dict: Configuração, abertura a frio (ms), resumo por nível e total de erros
+    """
+    niveis = sorted(niveis or NIVEIS_PADRAO)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        np.random.seed(semente)
+        gerar_dados_cenario(n_clientes, cenario).to_csv(Path(diretorio) / "cancelamentos.csv", index=False)
+
+        porta = _porta_livre()
+        url = f"ws://127.0.0.1:{porta}/_stcore/stream"
+        servidor = iniciar_servidor(diretorio, porta)
+
+        try:
+            frio = asyncio.run(_executar_nivel(url, 1, 0, semente))
+            resumo_niveis = []
+            for indice, n_sessoes in enumerate(niveis):
+                resultado = asyncio.run(_executar_nivel(url, n_sessoes, n_reruns, semente + indice + 1))
+                resumo_niveis.append(_resumir_nivel(n_sessoes, resultado, memoria_servidor_mb(servidor.pid)))
+        finally:
+            parar_servidor(servidor)
+
+    return {
+        'reruns_por_sessao': n_reruns,
+        'clientes': n_clientes,
+        'cenario': cenario,
+        'abertura_fria_ms': frio['abertura'][0] * 1000 if frio['abertura'] else np.nan,
+        'niveis': resumo_niveis,
+        'erros': len(frio['erros']) + sum(nivel['erros'] for nivel in resumo_niveis),
+        'exemplos_erros': (frio['erros'] + [erro for nivel in resumo_niveis for erro in nivel['exemplos_erros']])[:3]
+    }
+
+
+def imprimir_relatorio(resumo):
+    """
+    Mostra o resumo do teste de carga no terminal (uma linha por nível).
+    """
+    print(f"🧪 {resumo['clientes']:,} clientes ('{resumo['cenario']}') | "
+          f"{resumo['reruns_por_sessao']} reruns por sessão | 1 servidor")
+    print(f"🥶 Abertura com servidor frio: {resumo['abertura_fria_ms']:.0f} ms")
+    print()
+    print(f"{'sessões':>8} {'simult.':>8} {'abertura p50':>13} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'máx':>8} {'p95 x1':>7} {'reruns/s':>9} {'RSS MB':>8}")
+
+    base_p95 = resumo['niveis'][0]['rerun_p95_ms'] if resumo['niveis'] else np.nan
+    for nivel in resumo['niveis']:
+        print(f"{nivel['sessoes']:>8} {nivel['reruns_simultaneos_max']:>8} {nivel['abertura_p50_ms']:>10.0f} ms "
+              f"{nivel['rerun_p50_ms']:>8.0f} {nivel['rerun_p95_ms']:>8.0f} {nivel['rerun_p99_ms']:>8.0f} "
+              f"{nivel['rerun_max_ms']:>8.0f} {nivel['rerun_p95_ms'] / base_p95:>6.1f}x "
+              f"{nivel['vazao_reruns_s']:>9.1f} {nivel['rss_servidor_mb']:>8,.0f}")
+
+    print()
+    print(f"❌ Erros: {resumo['erros']}")
+    for erro in resumo['exemplos_erros']:
+        print(f"   - {erro}")
+
+
+def main(argumentos=None):
+    """
+    Ponto de entrada da linha de comando.
+
+    Returns:
+      int: 0 se passou, 1 se houve erros ou o p95 de algum nível estourou o limite
+    """
+    parser = argparse.ArgumentParser(description="Teste de carga do dashboard de churn")
+    parser.add_argument('--sessoes', type=int, nargs='+', default=NIVEIS_PADRAO,
+                        help="Níveis de concorrência (sessões simultâneas)")
+    parser.add_argument('--reruns', type=int, default=5, help="Interações por sessão")
+    parser.add_argument('--clientes', type=int, default=100000, help="Tamanho da base gerada")
+    parser.add_argument('--cenario', default='producao', choices=list(CENARIOS), help="Cenário do gerador")
+    parser.add_argument('--semente', type=int, default=0, help="Semente da base e das interações")
+    parser.add_argument('--p95-max', type=float, default=None, help="Limite de p95 (ms) para falhar")
+    parser.add_argument('--json', action='store_true', help="Imprime o resumo em JSON")
+    args = parser.parse_args(argumentos)
+
+    resumo = executar_carga(args.sessoes, args.reruns, args.clientes, args.cenario, args.semente)
+
+    if args.json:
+        print(json.dumps(resumo, ensure_ascii=False, indent=2))
+    else:
+        imprimir_relatorio(resumo)
+
+    if resumo['erros']:
+        return 1
+    if args.p95_max is not None:
+        acima = [nivel for nivel in resumo['niveis'] if nivel['rerun_p95_ms'] > args.p95_max]
+        for nivel in acima:
+            print(f"🚨 {nivel['sessoes']} sessões: p95 {nivel['rerun_p95_ms']:.0f} ms "
+                  f"acima do limite de {args.p95_max:.0f} ms")
+        if acima:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
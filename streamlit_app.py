@@ -1,12 +1,54 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import os
+import sys
 from pathlib import Path
 
+# Módulos auxiliares ficam em src/ (mesmo caminho usado pelos testes)
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from metricas_diarias import (
+    construir_acumulados,
+    consultar_intervalo,
+    agregar_por_mes,
+    calcular_tendencia_movel,
+    JANELAS_MOVEIS
+)
+from gerenciador_bases import GerenciadorBases, MEMORIA_MAXIMA_PADRAO_MB
+from segmentos import calcular_segmentos, ranquear_segmentos, descrever_segmento, MINIMO_CLIENTES_PADRAO
+from estatistica import bootstrap_diferenca_medias, criar_pool_processos, N_REAMOSTRAS_PADRAO
+from navegador_dados import NavegadorDados, TAMANHOS_PAGINA
+from snapshots import (
+    salvar_snapshot,
+    listar_snapshots,
+    carregar_snapshot,
+    comparar_snapshots,
+    descrever_versao,
+    ESTADO_ATIVO,
+    ESTADO_CANCELADO,
+    ESTADO_DESCONHECIDO
+)
+from exportacao import exportar_temporario, FORMATOS
+
 ## CONSTANTES - Valores fixos para simplificação
 CANCELADOS = 1
 ATIVO = 0
 
+## Bases de dados: pasta com os CSVs, base padrão e orçamento de memória (MB)
+DIRETORIO_DADOS = Path(os.environ.get('CHURN_DIR_DADOS', Path(__file__).resolve().parent / "data"))
+BASE_PADRAO = 'cancelamentos'
+MEMORIA_MAXIMA_MB = float(os.environ.get('CHURN_MEMORIA_MAX_MB', MEMORIA_MAXIMA_PADRAO_MB))
+DIRETORIO_SNAPSHOTS = DIRETORIO_DADOS / ".snapshots"
+
+## Linhas exibidas em cada tabela da comparação entre versões
+LIMITE_LINHAS_COMPARACAO = 1000
+
+## Estados que aparecem nas duas versões (antes/depois) no fluxo de churn
+ESTADOS_VERSAO = (ESTADO_ATIVO, ESTADO_CANCELADO, ESTADO_DESCONHECIDO)
+
 ## Colunas que o CSV deve ter (baseado no gerador_base.py)
 COLUNAS_NECESSARIAS = [
     'id_cliente',
@@ -65,21 +107,39 @@ else:
 
 
 ## Funções Auxiliares
-@st.cache_data
-def carregar_dados():
+@st.cache_resource
+def obter_gerenciador(diretorio=DIRETORIO_DADOS, memoria_maxima_mb=MEMORIA_MAXIMA_MB):
     """
-    Carrega os dados de cancelamento do CSV
+    Cria o gerenciador de bases (um por processo, compartilhado entre sessões)
+
+    A pasta e o orçamento entram na chave do cache: mudar CHURN_DIR_DADOS ou
+    CHURN_MEMORIA_MAX_MB cria um novo gerenciador.
+
+    Args:
+      diretorio: Pasta com os CSVs das bases
+      memoria_maxima_mb: Orçamento de memória das bases residentes
 
     Returns:
-      pd.DataFrame: DataFrame com dados de clientes, ou None se houver erro
+      GerenciadorBases: Gerenciador da pasta informada
+    """
+    return GerenciadorBases(diretorio, memoria_maxima_mb)
+
+
+def carregar_dados(nome=BASE_PADRAO):
     """
-    BASE_DIR = Path(__file__).resolve().parent
-    caminho_csv = BASE_DIR / "data" / "cancelamentos.csv"
+    Carrega os dados de cancelamento de uma base
+
+    A base é lida e convertida uma vez e fica residente enquanto couber no
+    orçamento de memória. Todas as sessões recebem o mesmo DataFrame somente
+    leitura (sem cópia por sessão).
 
-    if not caminho_csv.exists():
-        return None
+    Args:
+      nome: Nome da base (arquivo CSV sem extensão)
 
-    return pd.read_csv(caminho_csv)
+    Returns:
+      pd.DataFrame: DataFrame com dados de clientes, ou None se houver erro
+    """
+    return obter_gerenciador(DIRETORIO_DADOS, MEMORIA_MAXIMA_MB).obter(nome)
 
 
 def validar_dados(df):
@@ -106,6 +166,10 @@ def validar_dados(df):
 def calcular_metricas(df):
     """
     Calcula as métricas principais do dashboard
+
+    Função de referência: o app usa metricas_diarias.consultar_intervalo
+    (acumulados diários); esta versão direta sobre o DataFrame é a
+    definição das métricas contra a qual os acumulados são testados.
     
     Args:
       df: DataFrame com os dados de clientes
@@ -152,31 +216,62 @@ def formatar_moeda(valor):
     return f"R${valor_formatado}"
 
 
-def calcular_insight(df):
+def calcular_insight(df, n_reamostras=N_REAMOSTRAS_PADRAO, semente=42, executor=None):
     """
     Calcula insights automáticos sobre os dados
 
+    As diferenças (atraso de quem cancela vs. quem fica e churn de cada
+    contrato vs. os demais) vêm com teste de bootstrap, para os alertas só
+    dispararem quando a diferença não for ruído.
+
     Args:
       df: DataFrame com os dados de clientes
+      n_reamostras: Quantidade de reamostras do bootstrap
+      semente: Semente aleatória (fixa para o resultado não mudar a cada rerun)
+      executor: Pool de processos reutilizável para os bootstraps grandes
 
     Returns:
-      dict: Dicionário com os insights calculados
+      dict: Dicionário com os insights calculados ('testes_contrato' fica
+      vazio quando a seleção tem um único contrato)
     """
     
     # Médias de atraso
-    media_atraso_cancelados = df[df['cancelado'] == CANCELADOS]['dias_atraso'].mean()
-    media_atraso_ativos = df[df['cancelado'] == ATIVO]['dias_atraso'].mean()
+    atraso_cancelados = df[df['cancelado'] == CANCELADOS]['dias_atraso']
+    atraso_ativos = df[df['cancelado'] == ATIVO]['dias_atraso']
+    media_atraso_cancelados = atraso_cancelados.mean()
+    media_atraso_ativos = atraso_ativos.mean()
+
+    teste_atraso = bootstrap_diferenca_medias(
+        atraso_cancelados.to_numpy(), atraso_ativos.to_numpy(), n_reamostras, semente=semente, executor=executor
+    )
 
     # Análise por contrato
-    churn_contrato = df.groupby("duracao_contrato")[["cancelado"]].mean().reset_index()
+    churn_contrato = df.groupby("duracao_contrato", observed=True)[["cancelado"]].mean().reset_index()
     churn_contrato['cancelado'] = churn_contrato['cancelado'] * 100
     pior_contrato = churn_contrato.loc[churn_contrato['cancelado'].idxmax(), 'duracao_contrato']
 
+    # Churn de cada contrato vs. o restante da base (diferença em pontos percentuais)
+    # Com um único contrato na seleção não há com o que comparar: sem testes
+    cancelado = df['cancelado'].to_numpy()
+    contratos = df['duracao_contrato'].to_numpy()
+    testes_contrato = {}
+    for contrato in churn_contrato['duracao_contrato'] if len(churn_contrato) > 1 else []:
+        do_contrato = contratos == contrato
+        teste = bootstrap_diferenca_medias(
+            cancelado[do_contrato], cancelado[~do_contrato], n_reamostras, semente=semente, executor=executor
+        )
+        testes_contrato[contrato] = {
+            chave: valor * 100 if chave in ('diferenca', 'ic_inferior', 'ic_superior') else valor
+            for chave, valor in teste.items()
+        }
+
     return {
         'media_atraso_cancelados': media_atraso_cancelados,
         'media_atraso_ativos': media_atraso_ativos,
+        'teste_atraso': teste_atraso,
         'pior_contrato': pior_contrato,
-        'churn_contrato': churn_contrato
+        'churn_contrato': churn_contrato,
+        'testes_contrato': testes_contrato
     }
 
 
@@ -188,6 +283,9 @@ def converter_coluna_data(df):
     - Pandas precisa saber que é uma data para ser filtrada
     - Sem conversão, a coluna é tratada como texto
 
+    Função de referência: o app converte as datas em
+    base_compartilhada.preparar_base (mesma regra, errors='coerce').
+
     Args:
       df: DataFrame com coluna 'data_cadastro' como string
 
@@ -200,18 +298,157 @@ def converter_coluna_data(df):
     return df
 
 
+@st.cache_resource(max_entries=32)
+def carregar_acumulados(nome, versao):
+    """
+    Constrói (uma vez por versão da base) os acumulados diários
+
+    Args:
+      nome: Nome da base
+      versao: Versão da base (muda quando o CSV é atualizado)
+
+    Returns:
+      dict: Arrays acumulados de metricas_diarias.construir_acumulados
+    """
+    return construir_acumulados(carregar_dados(nome))
+
+
+@st.cache_data(max_entries=32)
+def obter_segmentos(nome, versao):
+    """
+    Calcula (uma vez por versão da base) as métricas de todos os segmentos
+
+    Args:
+      nome: Nome da base
+      versao: Versão da base (muda quando o CSV é atualizado)
+
+    Returns:
+      pd.DataFrame: Resultado de segmentos.calcular_segmentos
+    """
+    return calcular_segmentos(carregar_dados(nome))
+
+
+@st.cache_resource(max_entries=8)
+def obter_navegador(nome, versao):
+    """
+    Cria (uma vez por versão da base) os índices do navegador de dados brutos
+
+    O navegador não guarda a base: entradas deste cache não impedem o
+    gerenciador de liberar bases removidas do orçamento de memória.
+
+    Args:
+      nome: Nome da base
+      versao: Versão da base (muda quando o CSV é atualizado)
+
+    Returns:
+      NavegadorDados: Índice de id_cliente e ordenações da base
+    """
+    return NavegadorDados(carregar_dados(nome))
+
+
+def filtrar_base(df, data_inicial, data_final, contrato):
+    """
+    Monta a máscara dos filtros de período e contrato
+
+    Args:
+      df: Base com 'data_cadastro' (datetime) e 'duracao_contrato'
+      data_inicial: Primeiro dia do período (inclusivo)
+      data_final: Último dia do período (inclusivo)
+      contrato: Tipo de contrato ou 'Todos'
+
+    Returns:
+      pd.Series: Máscara booleana das linhas selecionadas
+    """
+    mascara = (
+        (df['data_cadastro'] >= pd.to_datetime(data_inicial)) &
+        (df['data_cadastro'] <= pd.to_datetime(data_final))
+    )
+    if contrato != 'Todos':
+        mascara &= df['duracao_contrato'] == contrato
+    return mascara
+
+
+@st.cache_resource
+def obter_pool_processos():
+    """
+    Cria o pool de processos dos bootstraps (um por processo do servidor)
+
+    Returns:
+      ProcessPoolExecutor: Pool compartilhado entre sessões e reruns
+    """
+    return criar_pool_processos()
+
+
+@st.cache_data(max_entries=256)
+def obter_insights(nome, versao, data_inicial, data_final, contrato):
+    """
+    Calcula (uma vez por base, versão e filtros) os insights com testes de significância
+
+    Reruns com os mesmos filtros, em qualquer sessão, reaproveitam o resultado
+    em vez de refazer os bootstraps.
+
+    Returns:
+      dict: Resultado de calcular_insight para a seleção
+    """
+    df = carregar_dados(nome)
+    df_filtrado = df[filtrar_base(df, data_inicial, data_final, contrato)]
+    return calcular_insight(df_filtrado, executor=obter_pool_processos())
+
+
+@st.cache_resource(max_entries=32)
+def registrar_snapshot(nome, versao):
+    """
+    Salva (uma vez por versão da base) o snapshot usado na comparação entre versões
+
+    Args:
+      nome: Nome da base
+      versao: Versão da base (muda quando o CSV é atualizado)
+
+    Returns:
+      Path: Caminho do snapshot
+    """
+    return salvar_snapshot(carregar_dados(nome), DIRETORIO_SNAPSHOTS, nome, versao)
+
+
+@st.cache_resource(max_entries=8)
+def obter_comparacao(nome, versao_antiga, versao_nova):
+    """
+    Compara (uma vez por par de versões) os snapshots de uma base
+
+    Returns:
+      dict: Resultado de snapshots.comparar_snapshots
+    """
+    return comparar_snapshots(
+        carregar_snapshot(DIRETORIO_SNAPSHOTS, nome, versao_antiga),
+        carregar_snapshot(DIRETORIO_SNAPSHOTS, nome, versao_nova)
+    )
+
+
+## Seleção da base
+gerenciador = obter_gerenciador(DIRETORIO_DADOS, MEMORIA_MAXIMA_MB)
+bases_disponiveis = gerenciador.listar()
+
+if not bases_disponiveis:
+    st.error(f"❌ ERRO: Nenhum arquivo CSV encontrado em {DIRETORIO_DADOS}.")
+    st.info("💡 Verifique se o arquivo data/cancelamentos.csv está versionado no GitHub.")
+    st.stop()
+
+base_selecionada = st.sidebar.selectbox(
+    "🗂️ Base de dados",
+    options=bases_disponiveis,
+    index=bases_disponiveis.index(BASE_PADRAO) if BASE_PADRAO in bases_disponiveis else 0,
+    help="Cada unidade de negócio tem seu próprio arquivo CSV"
+)
+
 ## Validação de dados
-df = carregar_dados()
+df = carregar_dados(base_selecionada)
 
 # Verifica se o arquivo existe
 if df is None:
-    st.error("❌ ERRO: Arquivo data/cancelamentos.csv não encontrado.")
+    st.error(f"❌ ERRO: Arquivo {base_selecionada}.csv não encontrado.")
     st.info("💡 Verifique se o arquivo está versionado no GitHub.")
     st.stop()
 
-# Converter coluna de data
-df = converter_coluna_data(df)
-
 # Verifica se as colunas necessárias existem
 valido, colunas_faltantes = validar_dados(df)
 
@@ -224,6 +461,13 @@ if not valido:
 if len(df) == 0:
     st.warning("⚠️ Aviso: O arquivo CSV está vazio!")
     st.stop()
+
+# Guarda o snapshot desta versão para comparar com as próximas
+# (falhar aqui nunca impede o dashboard de abrir)
+try:
+    registrar_snapshot(base_selecionada, gerenciador.versao(base_selecionada))
+except Exception as erro:
+    st.warning(f"⚠️ Não foi possível salvar o snapshot desta versão da base ({erro}). A comparação entre versões pode ficar incompleta.")
     
 ## Interface do Dashboard
 st.title("📊 Análise de Cancelamento de Clientes")
@@ -273,19 +517,11 @@ if data_inicial > data_final:
 
 ## I. Aplicar filtros no DataFrame
 
-# Converter data_inicial e data_final para datetime
-data_inicial_dt = pd.to_datetime(data_inicial)
-data_final_dt = pd.to_datetime(data_final)
-
-# Filtro por data
-df_filtrado = df[
-    (df['data_cadastro'] >= data_inicial_dt) & 
-    (df['data_cadastro'] <= data_final_dt)
-].copy()  # .copy() cria uma cópia para evitar warnings do pandas
+# Filtros de período e tipo de contrato
+mascara = filtrar_base(df, data_inicial, data_final, filtro_contrato)
 
-# Filtro por tipo de contrato
-if filtro_contrato != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['duracao_contrato'] == filtro_contrato]
+# A base é compartilhada e somente leitura: o filtro gera um novo DataFrame da sessão
+df_filtrado = df[mascara]
 
 # Mostrar informações sobre os filtros aplicados
 total_original = len(df)
@@ -302,11 +538,13 @@ if len(df_filtrado) == 0:
 ## II. KPIs Principais
 st.subheader("📈 Métricas Principais")
 
-metricas = calcular_metricas(df)
+# Consulta em tempo constante nos acumulados diários (respeita os filtros)
+acumulados = carregar_acumulados(base_selecionada, gerenciador.versao(base_selecionada))
+metricas = consultar_intervalo(acumulados, data_inicial, data_final, filtro_contrato)
 
 col1, col2, col3, col4 = st.columns(4)
 
-col1.metric("👥 Base Total", metricas['total'])
+col1.metric("👥 Clientes no Filtro", metricas['total'])
 col2.metric("❌ Cancelamentos", metricas['cancelados'])
 col3.metric("📊 Taxa de Churn", f"{metricas['taxa_churn']:.1f}%")
 col4.metric("💰 Receita Perdida", formatar_moeda(metricas['receita_perdida']))
@@ -317,7 +555,69 @@ st.divider()
 st.subheader("🔍 Quem fica vs Quem sai")
 
 if st.checkbox("Mostrar dados brutos"):
-    st.dataframe(df_filtrado.head(10)) # Mostra 10 primeiras linhas
+    navegador = obter_navegador(base_selecionada, gerenciador.versao(base_selecionada))
+
+    id_busca = st.number_input(
+        "🔎 Buscar por id_cliente",
+        min_value=0,
+        value=None,
+        step=1,
+        help="Busca direta no índice de clientes (ignora os filtros)"
+    )
+
+    if id_busca is not None:
+        posicoes_cliente = navegador.buscar_cliente(id_busca)
+        if len(posicoes_cliente) == 0:
+            st.warning(f"⚠️ Cliente {id_busca} não encontrado.")
+        else:
+            st.dataframe(df.iloc[posicoes_cliente], width='stretch')
+            if not mascara.to_numpy()[posicoes_cliente].any():
+                st.caption("Este cliente está fora dos filtros selecionados.")
+    else:
+        col_ordem, col_direcao, col_tamanho, col_pagina = st.columns(4)
+
+        with col_ordem:
+            coluna_ordem = st.selectbox(
+                "Ordenar por",
+                options=[None] + list(df.columns),
+                format_func=lambda coluna: "Ordem original" if coluna is None else coluna
+            )
+
+        with col_direcao:
+            crescente = st.radio("Direção", options=[True, False], format_func=lambda c: "↑ Crescente" if c else "↓ Decrescente", horizontal=True)
+
+        with col_tamanho:
+            tamanho_pagina = st.selectbox("Linhas por página", options=TAMANHOS_PAGINA)
+
+        with col_pagina:
+            total_paginas = max(1, -(-total_filtrado // tamanho_pagina))
+            numero_pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, step=1)
+
+        # Só a página atual é montada e enviada ao navegador
+        pagina, total_paginas, _ = navegador.pagina(df, mascara.to_numpy(), numero_pagina, tamanho_pagina, coluna_ordem, crescente)
+        st.dataframe(pagina, width='stretch')
+        st.caption(f"Página {numero_pagina} de {total_paginas:,} ({total_filtrado:,} clientes)")
+
+# Exportação dos dados filtrados (gerada em blocos só quando o usuário clica)
+col_formato, col_download = st.columns([1, 3])
+
+with col_formato:
+    formato_exportacao = st.selectbox(
+        "Formato",
+        options=list(FORMATOS),
+        format_func=str.upper,
+        help="Parquet é menor e mais rápido para bases grandes"
+    )
+
+with col_download:
+    posicoes_filtradas = np.flatnonzero(mascara.to_numpy())
+    st.download_button(
+        f"⬇️ Exportar {total_filtrado:,} clientes filtrados",
+        data=lambda: exportar_temporario(df, formato_exportacao, posicoes_filtradas),
+        file_name=f"{base_selecionada}_{data_inicial}_{data_final}.{FORMATOS[formato_exportacao]['extensao']}",
+        mime=FORMATOS[formato_exportacao]['mime'],
+        on_click='ignore'
+    )
 
 ## IV. Gráficos de Análise
 st.subheader("📊 Análises Visuais")
@@ -358,7 +658,8 @@ st.divider()
 ## V. Calcular insights para Análise de Contrato
 st.subheader("Análise por Tipo de Contrato")
 
-insights = calcular_insight(df_filtrado)
+# Bootstraps em cache por filtro: não são refeitos a cada rerun
+insights = obter_insights(base_selecionada, gerenciador.versao(base_selecionada), data_inicial, data_final, filtro_contrato)
 
 fig_contrato = px.bar(
     insights['churn_contrato'],
@@ -380,27 +681,8 @@ st.plotly_chart(fig_contrato, width='stretch')
 st.divider()
 st.subheader("📈 Evolução de Cancelamentos no Tempo")
 
-# Agrupar dados por mês
-# 'M' = agrupar p/ mês (Month)
-# 'ME' = fim do mês (Month End)
-df_temporal = df_filtrado.copy()
-df_temporal['mes'] = df_temporal['data_cadastro'].dt.to_period('M')
-
-cancelamentos_por_mes = df_temporal.groupby('mes').agg({
-    'cancelado': ['sum', 'count'] # sum = total cancelados, count = total clientes
-}).reset_index()
-
-# Renomear colunas para facilitar
-cancelamentos_por_mes.columns = ['mes', 'cancelados', 'total_clientes']
-
-# Cálculo da taxa churn mensal
-cancelamentos_por_mes['taxa_churn'] = (
-    cancelamentos_por_mes['cancelados'] /
-    cancelamentos_por_mes['total_clientes'] * 100
-)
-
-# Converter Period para string
-cancelamentos_por_mes['mes'] = cancelamentos_por_mes['mes'].astype(str)
+# Totais mensais a partir dos acumulados diários (sem reagrupar o DataFrame)
+cancelamentos_por_mes = agregar_por_mes(acumulados, data_inicial, data_final, filtro_contrato)
 
 # Criar gráfico de linha
 fig_temporal = px.line(
@@ -443,6 +725,49 @@ with st.expander("📊 Ver dados detalhados por mês"):
         width='stretch'
     )
 
+# Tendências móveis (7/30/90 dias)
+st.markdown("**Tendências móveis**")
+
+col_janela, col_indicador = st.columns(2)
+
+with col_janela:
+    janelas = st.multiselect(
+        "Janelas",
+        options=JANELAS_MOVEIS,
+        default=[30],
+        format_func=lambda dias: f"{dias} dias",
+        help="Cada ponto resume os últimos N dias até a data"
+    )
+
+with col_indicador:
+    indicador = st.radio(
+        "Indicador",
+        options=['taxa_churn', 'media_cancelamentos'],
+        format_func=lambda nome: "Taxa de churn (%)" if nome == 'taxa_churn' else "Média móvel de cancelamentos/dia",
+        horizontal=True
+    )
+
+if janelas:
+    tendencias = pd.concat(
+        [calcular_tendencia_movel(acumulados, janela, data_inicial, data_final, filtro_contrato) for janela in janelas],
+        ignore_index=True
+    )
+
+    fig_movel = px.line(
+        tendencias,
+        x='data',
+        y=indicador,
+        color='janela',
+        title="Tendência Móvel",
+        labels={
+            'data': 'Data',
+            'janela': 'Janela',
+            'taxa_churn': 'Taxa de Churn (%)',
+            'media_cancelamentos': 'Cancelamentos/dia'
+        }
+    )
+    st.plotly_chart(fig_movel, width='stretch')
+
 ## VII. Insights Automáticos
 st.divider()
 st.subheader("Insights Automáticos")
@@ -454,15 +779,179 @@ with col1:
     st.write(f"Média de atraso de quem cancela: {insights['media_atraso_cancelados']:.1f} dias")
     st.write(f"Média de atraso de quem fica: {insights['media_atraso_ativos']:.1f} dias")
 
-    # Alerta se a diferença for significativa
-    if insights['media_atraso_cancelados'] > insights['media_atraso_ativos'] * 2:
+    teste_atraso = insights['teste_atraso']
+    if teste_atraso['significativo']:
+        st.write(
+            f"Diferença: {teste_atraso['diferenca']:.1f} dias "
+            f"(IC 95%: {teste_atraso['ic_inferior']:.1f} a {teste_atraso['ic_superior']:.1f}; "
+            f"p = {teste_atraso['p_valor']:.3f})"
+        )
+
+    # Alerta só se a diferença for grande E estatisticamente significativa
+    if insights['media_atraso_cancelados'] > insights['media_atraso_ativos'] * 2 and teste_atraso['significativo']:
         st.error("CRÍTICO: Clientes que cancelam atrasam o dobro do tempo!")
+    elif not teste_atraso['significativo']:
+        st.caption("A diferença de atraso não é estatisticamente significativa nesta seleção.")
 
 with col2:
     st.info("Sobre contratos")
-    st.write(f"O tipo de contrato com maior rejeição é: {insights['pior_contrato']}")
-    st.warning(f"🚨 SUGESTÃO: Criar incentivos para migrar clientes do {insights['pior_contrato']} para outros planos")
 
-## VIII. Rodapé
+    teste_contrato = insights['testes_contrato'].get(insights['pior_contrato'])
+    if teste_contrato is None:
+        # Um único contrato na seleção (ex.: filtro de contrato): nada a comparar
+        st.caption(f"A seleção tem apenas o contrato {insights['pior_contrato']}: não há outros contratos para comparar.")
+    else:
+        st.write(f"O tipo de contrato com maior rejeição é: {insights['pior_contrato']}")
+
+        if teste_contrato['significativo'] and teste_contrato['diferenca'] > 0:
+            st.write(
+                f"Churn {teste_contrato['diferenca']:.1f} p.p. acima dos demais contratos "
+                f"(IC 95%: {teste_contrato['ic_inferior']:.1f} a {teste_contrato['ic_superior']:.1f}; "
+                f"p = {teste_contrato['p_valor']:.3f})"
+            )
+            st.warning(f"🚨 SUGESTÃO: Criar incentivos para migrar clientes do {insights['pior_contrato']} para outros planos")
+        else:
+            st.caption("A diferença de churn entre contratos não é estatisticamente significativa nesta seleção.")
+
+## VIII. Segmentos de maior risco
+st.divider()
+st.subheader("🎯 Segmentos de Maior Risco")
+st.markdown("Combinações de assinatura, contrato, gênero, faixa etária e faixa de atraso com mais churn (base completa).")
+
+col_minimo, col_ordem, col_limite = st.columns(3)
+
+with col_minimo:
+    minimo_clientes = st.number_input(
+        "Tamanho mínimo do segmento",
+        min_value=1,
+        value=MINIMO_CLIENTES_PADRAO,
+        step=10,
+        help="Segmentos pequenos têm taxas instáveis"
+    )
+
+with col_ordem:
+    ordenar_por = st.radio(
+        "Ordenar por",
+        options=['taxa_churn', 'receita_perdida'],
+        format_func=lambda nome: "Taxa de churn" if nome == 'taxa_churn' else "Receita perdida",
+        horizontal=True
+    )
+
+with col_limite:
+    limite_segmentos = st.slider("Quantidade de segmentos", min_value=5, max_value=100, value=20, step=5)
+
+segmentos = obter_segmentos(base_selecionada, gerenciador.versao(base_selecionada))
+ranking = ranquear_segmentos(segmentos, minimo_clientes, ordenar_por, limite_segmentos)
+
+if len(ranking) == 0:
+    st.warning("⚠️ Nenhum segmento com esse tamanho mínimo.")
+else:
+    ranking['segmento'] = ranking.apply(descrever_segmento, axis=1)
+
+    fig_segmentos = px.bar(
+        ranking.head(10).iloc[::-1],
+        x=ordenar_por,
+        y='segmento',
+        orientation='h',
+        title="Top 10 Segmentos",
+        labels={
+            'segmento': 'Segmento',
+            'taxa_churn': 'Taxa de Churn (%)',
+            'receita_perdida': 'Receita Perdida (R$)'
+        },
+        color=ordenar_por,
+        color_continuous_scale="Reds",
+        hover_data=['clientes', 'cancelados']
+    )
+    st.plotly_chart(fig_segmentos, width='stretch')
+
+    with st.expander(f"📋 Ver ranking ({len(ranking)} de {len(segmentos):,} segmentos)"):
+        st.dataframe(
+            ranking.drop(columns=['segmento']).style.format({
+                'taxa_churn': '{:.1f}%',
+                'receita_perdida': formatar_moeda
+            }),
+            hide_index=True,
+            width='stretch'
+        )
+
+## IX. Comparação entre versões
+st.divider()
+st.subheader("🔄 Comparação entre Versões da Base")
+
+versoes = listar_snapshots(DIRETORIO_SNAPSHOTS, base_selecionada)
+
+if len(versoes) < 2:
+    st.info("💡 Só existe uma versão desta base. Quando o CSV for atualizado, a comparação aparece aqui.")
+else:
+    col_antiga, col_nova = st.columns(2)
+
+    with col_antiga:
+        versao_antiga = st.selectbox("Versão anterior", options=versoes[::-1], index=1, format_func=descrever_versao)
+
+    with col_nova:
+        versao_nova = st.selectbox("Versão nova", options=versoes[::-1], index=0, format_func=descrever_versao)
+
+    comparacao = None
+    if versao_antiga >= versao_nova:
+        st.warning("⚠️ A versão anterior deve ser mais antiga que a versão nova.")
+    else:
+        try:
+            comparacao = obter_comparacao(base_selecionada, versao_antiga, versao_nova)
+        except Exception as erro:
+            st.warning(f"⚠️ Não foi possível comparar as versões selecionadas ({erro}).")
+
+    if comparacao is not None:
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("❌ Novos cancelamentos", f"{len(comparacao['novos_cancelados']):,}")
+        col2.metric("🔁 Reativações", f"{len(comparacao['reativacoes']):,}")
+        col3.metric("✏️ Alterados", f"{len(comparacao['alterados']):,}")
+        col4.metric("🆕 Novos clientes", f"{len(comparacao['novos_clientes']):,}")
+        col5.metric("🗑️ Removidos", f"{len(comparacao['removidos']):,}")
+
+        # Fluxo de churn entre as versões (Sankey)
+        fluxo = comparacao['fluxo']
+        if st.checkbox("Ocultar clientes que não mudaram de situação", value=True):
+            fluxo = fluxo[~fluxo['origem'].isin(ESTADOS_VERSAO) | (fluxo['origem'] != fluxo['destino'])]
+
+        if len(fluxo) > 0:
+            nos_origem = [f"{estado} (antes)" if estado in ESTADOS_VERSAO else estado for estado in fluxo['origem']]
+            nos_destino = [f"{estado} (depois)" if estado in ESTADOS_VERSAO else estado for estado in fluxo['destino']]
+            nos = list(dict.fromkeys(nos_origem + nos_destino))
+
+            fig_fluxo = go.Figure(go.Sankey(
+                node={'label': nos, 'pad': 20},
+                link={
+                    'source': [nos.index(no) for no in nos_origem],
+                    'target': [nos.index(no) for no in nos_destino],
+                    'value': fluxo['clientes'].tolist()
+                }
+            ))
+            fig_fluxo.update_layout(title="Fluxo de Churn entre Versões")
+            st.plotly_chart(fig_fluxo, width='stretch')
+
+        tabelas = {
+            'novos_cancelados': "❌ Novos cancelamentos",
+            'reativacoes': "🔁 Reativações",
+            'alterados': "✏️ Clientes com campos alterados",
+            'novos_clientes': "🆕 Novos clientes",
+            'removidos': "🗑️ Clientes removidos"
+        }
+        for chave, titulo in tabelas.items():
+            tabela = comparacao[chave]
+            with st.expander(f"{titulo} ({len(tabela):,})"):
+                st.dataframe(tabela.head(LIMITE_LINHAS_COMPARACAO), hide_index=True, width='stretch')
+                if len(tabela) > LIMITE_LINHAS_COMPARACAO:
+                    st.caption(f"Mostrando as primeiras {LIMITE_LINHAS_COMPARACAO:,} linhas.")
+
+## Uso de memória das bases (barra lateral)
+with st.sidebar.expander("💾 Memória das bases"):
+    estatisticas = gerenciador.estatisticas()
+    st.write(f"Residente: {estatisticas['memoria_residente_mb']:.1f} MB de {estatisticas['memoria_maxima_mb']:.1f} MB")
+    st.write(f"Acertos: {estatisticas['acertos']} | Faltas: {estatisticas['faltas']} | Remoções: {estatisticas['remocoes']}")
+    if estatisticas['residentes']:
+        st.dataframe(pd.DataFrame(estatisticas['residentes']), hide_index=True)
+
+## X. Rodapé
 st.divider()
 st.caption("Dashboard feito por Vinícius Forte com Streamlit 🚀")
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Testes para a base compartilhada entre sessões.
+
+A base precisa ser somente leitura para que uma sessão nunca altere os
+dados vistos pelas outras.
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from base_compartilhada import congelar_dataframe, preparar_base
+
+
+@pytest.fixture
+def df_csv():
+  """
+  DataFrame no formato devolvido pelo pd.read_csv.
+  """
+  return pd.DataFrame({
+    'id_cliente': [1, 2, 3],
+    'data_cadastro': ['2024-01-01', '2024-02-10', 'data_invalida'],
+    'duracao_contrato': ['Mensal', 'Anual', 'Mensal'],
+    'total_gasto': [100.0, 200.0, 300.0],
+    'cancelado': [1, 0, 0]
+  })
+
+
+class TestPrepararBase:
+  """
+  Testes para a preparação da base compartilhada.
+  """
+
+  def test_converte_tipos(self, df_csv):
+    """
+    Testa se datas viram datetime e textos viram categoria.
+    """
+    base = preparar_base(df_csv)
+
+    assert pd.api.types.is_datetime64_any_dtype(base['data_cadastro'])
+    assert pd.isna(base.loc[2, 'data_cadastro'])
+    assert isinstance(base['duracao_contrato'].dtype, pd.CategoricalDtype)
+
+  def test_base_somente_leitura(self, df_csv):
+    """
+    Testa se alterar a base compartilhada gera erro.
+    """
+    base = preparar_base(df_csv)
+
+    with pytest.raises(ValueError):
+      base.loc[0, 'total_gasto'] = 0
+
+    assert base.loc[0, 'total_gasto'] == 100.0
+
+  @pytest.mark.parametrize('alteracao', [
+    lambda base: base.__setitem__('nova', 1),
+    lambda base: base.__setitem__('total_gasto', 0.0),
+    lambda base: base.__delitem__('total_gasto'),
+    lambda base: base.drop(columns=['total_gasto'], inplace=True),
+    lambda base: base.rename(columns={'total_gasto': 'gasto'}, inplace=True),
+    lambda base: base.loc.__setitem__((slice(None), 'nova'), 1),
+  ], ids=['criar_coluna', 'substituir_coluna', 'del_coluna', 'drop_inplace', 'rename_inplace', 'loc_nova_coluna'])
+  def test_bloqueia_mudanca_de_estrutura(self, df_csv, alteracao):
+    """
+    Testa se criar, substituir ou remover colunas da base compartilhada gera erro.
+    """
+    # Arrange
+    base = preparar_base(df_csv)
+    colunas = list(base.columns)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+      alteracao(base)
+
+    assert list(base.columns) == colunas
+    assert (base['total_gasto'] == [100.0, 200.0, 300.0]).all()
+
+  def test_nao_altera_original(self, df_csv):
+    """
+    Testa se a preparação não modifica o DataFrame recebido.
+    """
+    preparar_base(df_csv)
+
+    assert df_csv.loc[0, 'data_cadastro'] == '2024-01-01'
+
+
+class TestCongelarDataframe:
+  """
+  Testes para o congelamento de DataFrames.
+  """
+
+  def test_filtro_gera_dataframe_da_sessao(self, df_csv):
+    """
+    Testa se um filtro sobre a base congelada pode ser alterado livremente.
+    """
+    base = congelar_dataframe(df_csv)
+
+    filtrado = base[base['cancelado'] == 0].copy()
+    filtrado['total_gasto'] = 0
+    filtrado['nova'] = 1
+    del filtrado['id_cliente']
+
+    assert (base['total_gasto'] > 0).all()
+    assert list(base.columns) == list(df_csv.columns)
+
+  def test_colunas_somente_leitura(self, df_csv):
+    """
+    Testa se todas as colunas ficam apoiadas em arrays somente leitura.
+    """
+    base = congelar_dataframe(df_csv)
+
+    assert not base['total_gasto'].to_numpy().flags.writeable
+    assert not base['duracao_contrato'].to_numpy().flags.writeable
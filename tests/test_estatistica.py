@@ -0,0 +1,148 @@
+"""
+Testes para o bootstrap dos insights automáticos.
+
+O teste deve apontar diferenças reais e ignorar ruído, especialmente em
+seleções pequenas.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from estatistica import bootstrap_diferenca_medias, criar_pool_processos, _usar_processos
+from streamlit_app import calcular_insight
+
+
+class TestBootstrapDiferencaMedias:
+  """
+  Testes para o teste de diferença de médias.
+  """
+
+  def test_diferenca_real_e_significativa(self):
+    """
+    Testa grupos com médias bem diferentes (dados discretos, como dias_atraso).
+    """
+    rng = np.random.default_rng(0)
+    atrasados = rng.choice([0, 15, 30, 60], 500, p=[0.2, 0.3, 0.3, 0.2])
+    em_dia = rng.choice([0, 15, 30, 60], 500, p=[0.6, 0.3, 0.08, 0.02])
+
+    resultado = bootstrap_diferenca_medias(atrasados, em_dia, semente=1)
+
+    assert resultado['significativo']
+    assert resultado['ic_inferior'] <= resultado['diferenca'] <= resultado['ic_superior']
+    assert resultado['ic_inferior'] > 0
+
+  def test_mesma_distribuicao_nao_e_significativa(self):
+    """
+    Testa dois grupos sorteados da mesma distribuição contínua.
+    """
+    rng = np.random.default_rng(1)
+    grupo_a = rng.normal(100, 20, 300)
+    grupo_b = rng.normal(100, 20, 300)
+
+    resultado = bootstrap_diferenca_medias(grupo_a, grupo_b, semente=1)
+
+    assert not resultado['significativo']
+    assert resultado['ic_inferior'] < 0 < resultado['ic_superior']
+
+  def test_grupo_pequeno_nunca_e_significativo(self):
+    """
+    Testa seleção minúscula: a diferença aparece, mas sem significância.
+    """
+    resultado = bootstrap_diferenca_medias([30, 40], [5, 15], semente=1)
+
+    assert resultado['diferenca'] == 25.0
+    assert not resultado['significativo']
+    assert np.isnan(resultado['p_valor'])
+
+  def test_mesma_semente_mesmo_resultado(self):
+    """
+    Testa se o resultado é reprodutível (não muda a cada rerun do app).
+    """
+    rng = np.random.default_rng(2)
+    grupo_a, grupo_b = rng.normal(0, 1, 200), rng.normal(0.1, 1, 200)
+
+    primeiro = bootstrap_diferenca_medias(grupo_a, grupo_b, semente=7)
+    segundo = bootstrap_diferenca_medias(grupo_a, grupo_b, semente=7)
+
+    assert primeiro == segundo
+
+  def test_varios_processos(self):
+    """
+    Testa as reamostras divididas entre dois processos.
+    """
+    rng = np.random.default_rng(3)
+    grupo_a, grupo_b = rng.normal(1, 1, 400), rng.normal(0, 1, 400)
+
+    resultado = bootstrap_diferenca_medias(grupo_a, grupo_b, n_reamostras=500, semente=1, n_processos=2)
+
+    assert resultado['significativo']
+    assert resultado['ic_inferior'] > 0
+
+  def test_pool_reutilizado(self):
+    """
+    Testa se um pool criado uma vez dá o mesmo resultado que o pool de cada chamada.
+    """
+    rng = np.random.default_rng(3)
+    grupo_a, grupo_b = rng.normal(1, 1, 400), rng.normal(0, 1, 400)
+    esperado = bootstrap_diferenca_medias(grupo_a, grupo_b, n_reamostras=500, semente=1, n_processos=2)
+
+    with criar_pool_processos(2) as pool:
+      resultados = [
+        bootstrap_diferenca_medias(grupo_a, grupo_b, n_reamostras=500, semente=1, n_processos=2, executor=pool)
+        for _ in range(2)
+      ]
+
+    assert resultados == [esperado, esperado]
+
+  def test_muitos_valores_discretos_sem_processos(self):
+    """
+    Testa se uma coluna com centenas de valores inteiros (como dias_atraso) e
+    grupos grandes continua no caminho multinomial, sem pool de processos.
+    """
+    rng = np.random.default_rng(4)
+    grupo_a, grupo_b = rng.integers(0, 500, 250_000), rng.integers(0, 500, 250_000)
+
+    assert _usar_processos(grupo_a, grupo_b, 1000, None) == 1
+
+
+class TestInsightsComSignificancia:
+  """
+  Testes para os testes estatísticos retornados por calcular_insight.
+  """
+
+  def test_contrato_com_churn_maior(self):
+    """
+    Testa se o contrato com churn claramente maior é significativo.
+    """
+    dados_teste = pd.DataFrame({
+      'cancelado': [1] * 60 + [0] * 40 + [1] * 10 + [0] * 90,
+      'dias_atraso': [0] * 200,
+      'duracao_contrato': ['Mensal'] * 100 + ['Anual'] * 100
+    })
+
+    insights = calcular_insight(dados_teste)
+
+    assert insights['pior_contrato'] == 'Mensal'
+    assert insights['testes_contrato']['Mensal']['significativo']
+    assert insights['testes_contrato']['Mensal']['diferenca'] == pytest.approx(50.0)
+    assert not insights['teste_atraso']['significativo']
+
+  def test_contrato_unico_sem_teste(self):
+    """
+    Testa se, com um único contrato na seleção, nenhum teste de contrato é feito.
+    """
+    dados_teste = pd.DataFrame({
+      'cancelado': [1] * 30 + [0] * 70,
+      'dias_atraso': [0] * 100,
+      'duracao_contrato': ['Mensal'] * 100
+    })
+
+    insights = calcular_insight(dados_teste)
+
+    assert insights['pior_contrato'] == 'Mensal'
+    assert insights['testes_contrato'] == {}
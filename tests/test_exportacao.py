@@ -0,0 +1,103 @@
+"""
+Testes para a exportação em blocos.
+
+O arquivo exportado deve ter exatamente as linhas selecionadas,
+independente do tamanho do bloco.
+"""
+
+import pytest
+import io
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from exportacao import exportar, exportar_temporario
+from gerador_base import gerar_dados_cenario
+
+
+@pytest.fixture
+def base():
+  """
+  Base pequena gerada com o cenário padrão.
+  """
+  return gerar_dados_cenario(1000, 'padrao')
+
+
+class TestExportar:
+  """
+  Testes para a exportação em CSV e Parquet.
+  """
+
+  def test_csv_com_blocos_pequenos(self, base):
+    """
+    Testa se o CSV em vários blocos tem um único cabeçalho e todas as linhas.
+    """
+    # Arrange
+    posicoes = np.flatnonzero(base['cancelado'].to_numpy() == 1)
+    destino = io.BytesIO()
+
+    # Act
+    exportar(base, 'csv', destino, posicoes, tamanho_bloco=37)
+    destino.seek(0)
+    exportado = pd.read_csv(destino)
+
+    # Assert
+    assert len(exportado) == len(posicoes)
+    assert exportado['id_cliente'].tolist() == base['id_cliente'].iloc[posicoes].tolist()
+    assert (exportado['cancelado'] == 1).all()
+
+  def test_csv_nomes_de_coluna_com_virgula_e_aspas(self):
+    """
+    Testa se nomes de coluna com vírgula e aspas são escritos entre aspas no cabeçalho.
+    """
+    df = pd.DataFrame({'valor, R$': [1.5, 2.5], 'nome "apelido"': ['a', 'b'], 'id': [1, 2]})
+    destino = io.BytesIO()
+
+    exportar(df, 'csv', destino, tamanho_bloco=1)
+    destino.seek(0)
+    exportado = pd.read_csv(destino)
+
+    pd.testing.assert_frame_equal(exportado, df)
+
+  def test_parquet_com_blocos_pequenos(self, base):
+    """
+    Testa se o Parquet em vários row groups preserva linhas e tipos.
+    """
+    destino = io.BytesIO()
+
+    exportar(base, 'parquet', destino, tamanho_bloco=300)
+    destino.seek(0)
+    exportado = pd.read_parquet(destino)
+
+    assert len(exportado) == len(base)
+    assert exportado['total_gasto'].sum() == pytest.approx(base['total_gasto'].sum())
+    assert pd.api.types.is_datetime64_any_dtype(exportado['data_cadastro'])
+
+  def test_selecao_vazia(self, base):
+    """
+    Testa exportação sem linhas: o CSV deve ter só o cabeçalho.
+    """
+    destino = io.BytesIO()
+
+    exportar(base, 'csv', destino, np.array([], dtype=np.int64))
+
+    assert destino.getvalue().decode('utf-8').strip() == ','.join(base.columns)
+
+  def test_formato_invalido(self, base):
+    """
+    Testa se um formato desconhecido gera erro.
+    """
+    with pytest.raises(ValueError):
+      exportar(base, 'xlsx', io.BytesIO())
+
+  def test_exportar_temporario(self, base):
+    """
+    Testa se o arquivo temporário volta posicionado no início.
+    """
+    with exportar_temporario(base, 'csv') as arquivo:
+      exportado = pd.read_csv(arquivo)
+
+    assert len(exportado) == len(base)
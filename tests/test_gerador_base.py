@@ -0,0 +1,90 @@
+"""
+Testes para o gerador de bases fictícias.
+
+Garantem que todo cenário gera dados no formato que o dashboard espera.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from gerador_base import gerar_dados_cenario, gerar_data_cadastro, obter_cenario, CENARIOS
+from streamlit_app import validar_dados
+
+
+class TestGerarDadosCenario:
+  """
+  Testes para a geração de bases por cenário.
+  """
+
+  @pytest.mark.parametrize('cenario', list(CENARIOS))
+  def test_cenario_gera_colunas_validas(self, cenario):
+    """
+    Testa se todo cenário gera as colunas obrigatórias e valores coerentes.
+    """
+    df = gerar_dados_cenario(2000, cenario)
+
+    valido, faltantes = validar_dados(df)
+
+    assert valido, f"Colunas faltantes: {faltantes}"
+    assert len(df) == 2000
+    assert df['id_cliente'].is_unique
+    assert set(df['cancelado'].unique()) <= {0, 1}
+    assert (df['total_gasto'] > 0).all()
+
+  def test_mix_de_contratos(self):
+    """
+    Testa se o mix de contratos segue as probabilidades do cenário.
+    """
+    df = gerar_dados_cenario(50000, 'mensalistas')
+
+    proporcao_mensal = (df['duracao_contrato'] == 'Mensal').mean()
+
+    assert proporcao_mensal == pytest.approx(0.85, abs=0.02)
+
+  def test_deriva_aumenta_churn(self):
+    """
+    Testa se o cenário com deriva tem mais churn no fim do período.
+    """
+    df = gerar_dados_cenario(50000, 'deterioracao')
+
+    primeiro_ano = df[df['data_cadastro'] < '2025-01-01']['cancelado'].mean()
+    segundo_ano = df[df['data_cadastro'] >= '2025-01-01']['cancelado'].mean()
+
+    assert segundo_ano > primeiro_ano
+
+  def test_cenario_desconhecido(self):
+    """
+    Testa se um nome de cenário inválido gera erro claro.
+    """
+    with pytest.raises(ValueError):
+      obter_cenario('inexistente')
+
+
+class TestGerarDataCadastro:
+  """
+  Testes para o sorteio vetorizado de datas.
+  """
+
+  def test_datas_dentro_do_periodo(self):
+    """
+    Testa se as datas ficam entre o início (inclusivo) e o fim (exclusivo).
+    """
+    datas = gerar_data_cadastro(10000, '2024-01-01', '2024-03-01', sazonalidade=0.5)
+
+    assert datas.dtype == np.dtype('datetime64[D]')
+    assert datas.min() >= np.datetime64('2024-01-01')
+    assert datas.max() < np.datetime64('2024-03-01')
+
+  def test_sazonalidade_concentra_no_mes_pico(self):
+    """
+    Testa se o mês de pico recebe mais cadastros que o mês oposto.
+    """
+    datas = pd.Series(gerar_data_cadastro(50000, sazonalidade=0.8, mes_pico=11))
+    por_mes = datas.dt.month.value_counts()
+
+    assert por_mes[11] > por_mes[5]
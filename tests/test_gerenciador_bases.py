@@ -0,0 +1,193 @@
+"""
+Testes para o gerenciador de várias bases.
+
+Verificam a residência LRU dentro do orçamento de memória e a recarga
+pela cópia em Parquet.
+"""
+
+import pytest
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from gerenciador_bases import GerenciadorBases, PASTA_CACHE
+from gerador_base import gerar_dados_cenario
+from base_compartilhada import memoria_dataframe
+
+
+@pytest.fixture
+def diretorio(tmp_path):
+  """
+  Pasta com três bases pequenas (uma por unidade de negócio).
+  """
+  for nome in ['norte', 'sul', 'leste']:
+    gerar_dados_cenario(2000, 'padrao').to_csv(tmp_path / f"{nome}.csv", index=False)
+  return tmp_path
+
+
+def orcamento_para(diretorio, n_bases):
+  """
+  Orçamento (MB) que comporta exatamente n_bases bases do fixture.
+  """
+  tamanho = memoria_dataframe(GerenciadorBases(diretorio).obter('norte'))
+  return (tamanho * n_bases + tamanho / 2) / 1024 ** 2
+
+
+class TestGerenciadorBases:
+  """
+  Testes para o gerenciador de bases.
+  """
+
+  def test_listar_bases(self, diretorio):
+    """
+    Testa se cada CSV vira uma base.
+    """
+    gerenciador = GerenciadorBases(diretorio)
+
+    assert gerenciador.listar() == ['leste', 'norte', 'sul']
+
+  def test_acerto_retorna_mesmo_objeto(self, diretorio):
+    """
+    Testa se a segunda leitura usa a base residente (sem cópia).
+    """
+    gerenciador = GerenciadorBases(diretorio)
+
+    primeira = gerenciador.obter('norte')
+    segunda = gerenciador.obter('norte')
+
+    assert primeira is segunda
+    assert gerenciador.acertos == 1
+    assert gerenciador.faltas == 1
+
+  def test_remove_base_menos_usada(self, diretorio):
+    """
+    Testa se, sem espaço, a base usada há mais tempo é removida.
+    """
+    gerenciador = GerenciadorBases(diretorio, orcamento_para(diretorio, 2))
+
+    gerenciador.obter('norte')
+    gerenciador.obter('sul')
+    gerenciador.obter('norte')  # 'sul' passa a ser a menos usada
+    gerenciador.obter('leste')
+
+    residentes = [item['base'] for item in gerenciador.estatisticas()['residentes']]
+
+    assert residentes == ['norte', 'leste']
+    assert gerenciador.remocoes == 1
+    assert gerenciador.memoria_residente() <= gerenciador.memoria_maxima
+
+  def test_recarrega_do_parquet(self, diretorio):
+    """
+    Testa se a base removida volta da cópia em Parquet com os mesmos dados.
+    """
+    gerenciador = GerenciadorBases(diretorio, orcamento_para(diretorio, 1))
+
+    original = gerenciador.obter('norte')
+    gerenciador.obter('sul')
+    recarregada = gerenciador.obter('norte')
+
+    assert list((diretorio / PASTA_CACHE).glob('norte-*.parquet'))
+    assert recarregada is not original
+    assert recarregada.equals(original)
+    assert not recarregada['total_gasto'].to_numpy().flags.writeable
+
+  def test_csv_atualizado_gera_nova_versao(self, diretorio):
+    """
+    Testa se um CSV novo substitui a base residente.
+    """
+    gerenciador = GerenciadorBases(diretorio)
+    antiga = gerenciador.obter('norte')
+
+    gerar_dados_cenario(500, 'padrao').to_csv(diretorio / 'norte.csv', index=False)
+    os.utime(diretorio / 'norte.csv', ns=(0, gerenciador.versao('norte') + 10 ** 9))
+    nova = gerenciador.obter('norte')
+
+    assert len(antiga) == 2000
+    assert len(nova) == 500
+    assert len(list((diretorio / PASTA_CACHE).glob('norte-*.parquet'))) == 1
+
+  def test_falha_na_copia_parquet_nao_impede_carga(self, diretorio, caplog):
+    """
+    Testa se, sem poder gravar a cópia em Parquet, a base é carregada do CSV.
+    """
+    # Arrange: um arquivo no lugar da pasta de cache faz a gravação falhar
+    (diretorio / PASTA_CACHE).write_text('')
+    gerenciador = GerenciadorBases(diretorio)
+
+    # Act
+    base = gerenciador.obter('norte')
+
+    # Assert
+    assert len(base) == 2000
+    assert gerenciador.obter('norte') is base
+    assert 'Parquet' in caplog.text
+
+  def test_base_inexistente(self, diretorio):
+    """
+    Testa base sem CSV: deve retornar None.
+    """
+    assert GerenciadorBases(diretorio).obter('oeste') is None
+
+
+class TestConcorrencia:
+  """
+  Testes para o uso do gerenciador por várias sessões ao mesmo tempo.
+  """
+
+  def test_carga_lenta_nao_bloqueia_outras_bases(self, diretorio):
+    """
+    Testa se, durante a carga de uma base, outra base residente continua disponível.
+    """
+    # Arrange
+    gerenciador = GerenciadorBases(diretorio)
+    norte = gerenciador.obter('norte')
+    carregar = gerenciador._carregar
+    iniciou, liberar = threading.Event(), threading.Event()
+
+    def carregar_lento(nome, versao):
+      iniciou.set()
+      liberar.wait(10)
+      return carregar(nome, versao)
+
+    gerenciador._carregar = carregar_lento
+    carga = threading.Thread(target=gerenciador.obter, args=('sul',))
+    carga.start()
+    iniciou.wait(10)
+
+    # Act
+    resultado = []
+    consulta = threading.Thread(target=lambda: resultado.append((gerenciador.obter('norte'), gerenciador.estatisticas())))
+    consulta.start()
+    consulta.join(5)
+    terminou_durante_carga = not consulta.is_alive()
+    liberar.set()
+    carga.join(10)
+
+    # Assert
+    assert terminou_durante_carga
+    assert resultado[0][0] is norte
+    assert [r['base'] for r in resultado[0][1]['residentes']] == ['norte']
+
+  def test_mesma_base_carregada_uma_vez(self, diretorio):
+    """
+    Testa se várias sessões pedindo a mesma base ao mesmo tempo geram uma única carga.
+    """
+    gerenciador = GerenciadorBases(diretorio)
+    cargas = []
+    carregar = gerenciador._carregar
+    gerenciador._carregar = lambda nome, versao: cargas.append(nome) or carregar(nome, versao)
+    resultados = []
+
+    sessoes = [threading.Thread(target=lambda: resultados.append(gerenciador.obter('leste'))) for _ in range(8)]
+    for sessao in sessoes:
+      sessao.start()
+    for sessao in sessoes:
+      sessao.join(30)
+
+    assert cargas == ['leste']
+    assert len(resultados) == 8
+    assert all(df is resultados[0] for df in resultados)
+    assert gerenciador.faltas == 1
+    assert gerenciador.acertos == 7
@@ -0,0 +1,143 @@
+"""
+Testes para as métricas diárias acumuladas.
+
+Os resultados das consultas em tempo constante devem bater com os
+cálculos feitos diretamente sobre o DataFrame filtrado.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from metricas_diarias import construir_acumulados, consultar_intervalo, agregar_por_mes, calcular_tendencia_movel
+from gerador_base import gerar_dados_cenario
+from streamlit_app import calcular_metricas
+
+
+@pytest.fixture
+def base():
+  """
+  Base pequena gerada com o cenário de produção.
+  """
+  return gerar_dados_cenario(5000, 'producao')
+
+
+class TestConsultarIntervalo:
+  """
+  Testes para a consulta de métricas por intervalo.
+  """
+
+  @pytest.mark.parametrize('contrato', ['Todos', 'Mensal', 'Anual'])
+  def test_igual_ao_filtro_do_dataframe(self, base, contrato):
+    """
+    Testa se a diferença dos acumulados é igual ao cálculo no DataFrame filtrado.
+    """
+    # Arrange
+    acumulados = construir_acumulados(base)
+    filtrado = base[(base['data_cadastro'] >= '2024-03-10') & (base['data_cadastro'] <= '2025-01-20')]
+    if contrato != 'Todos':
+      filtrado = filtrado[filtrado['duracao_contrato'] == contrato]
+
+    # Act
+    resultado = consultar_intervalo(acumulados, '2024-03-10', '2025-01-20', contrato)
+    esperado = calcular_metricas(filtrado)
+
+    # Assert
+    assert resultado['total'] == esperado['total']
+    assert resultado['cancelados'] == esperado['cancelados']
+    assert resultado['taxa_churn'] == pytest.approx(esperado['taxa_churn'])
+    assert resultado['receita_perdida'] == pytest.approx(esperado['receita_perdida'])
+
+  @pytest.mark.parametrize('contrato', ['Todos', 'Mensal'])
+  def test_valores_ausentes(self, base, contrato):
+    """
+    Testa se cancelado, total_gasto e contrato vazios seguem o cálculo no DataFrame.
+    """
+    # Arrange
+    base['cancelado'] = base['cancelado'].astype(float)
+    base['duracao_contrato'] = base['duracao_contrato'].astype(object)
+    base.loc[0:49, 'cancelado'] = np.nan
+    base.loc[50:99, 'total_gasto'] = np.nan
+    base.loc[100:149, 'duracao_contrato'] = np.nan
+    filtrado = base if contrato == 'Todos' else base[base['duracao_contrato'] == contrato]
+
+    # Act
+    resultado = consultar_intervalo(construir_acumulados(base), '2000-01-01', '2100-01-01', contrato)
+    esperado = calcular_metricas(filtrado)
+
+    # Assert
+    assert resultado['total'] == esperado['total']
+    assert resultado['cancelados'] == esperado['cancelados']
+    assert resultado['receita_perdida'] == pytest.approx(esperado['receita_perdida'])
+
+  def test_intervalo_fora_do_periodo(self, base):
+    """
+    Testa intervalo sem nenhum cliente: tudo deve ser zero.
+    """
+    acumulados = construir_acumulados(base)
+
+    resultado = consultar_intervalo(acumulados, '2030-01-01', '2030-12-31')
+
+    assert resultado['total'] == 0
+    assert resultado['taxa_churn'] == 0
+
+  def test_contrato_inexistente(self, base):
+    """
+    Testa contrato que não existe na base.
+    """
+    acumulados = construir_acumulados(base)
+
+    resultado = consultar_intervalo(acumulados, '2024-01-01', '2025-12-31', 'Bienal')
+
+    assert resultado['total'] == 0
+
+
+class TestAgregarPorMes:
+  """
+  Testes para a tabela mensal.
+  """
+
+  def test_igual_ao_agrupamento_por_mes(self, base):
+    """
+    Testa se os totais mensais batem com o groupby por período.
+    """
+    acumulados = construir_acumulados(base)
+    filtrado = base[(base['data_cadastro'] >= '2024-02-15') & (base['data_cadastro'] <= '2024-07-10')]
+    esperado = filtrado.groupby(filtrado['data_cadastro'].dt.to_period('M'))['cancelado'].agg(['sum', 'count'])
+
+    tabela = agregar_por_mes(acumulados, '2024-02-15', '2024-07-10')
+
+    assert tabela['mes'].tolist() == esperado.index.astype(str).tolist()
+    assert tabela['cancelados'].tolist() == esperado['sum'].tolist()
+    assert tabela['total_clientes'].tolist() == esperado['count'].tolist()
+
+
+class TestTendenciaMovel:
+  """
+  Testes para as tendências móveis.
+  """
+
+  def test_janela_de_sete_dias(self):
+    """
+    Testa a taxa móvel com dados simples: um cliente por dia, cancelando em dias alternados.
+    """
+    datas = pd.date_range('2024-01-01', periods=14, freq='D')
+    df = pd.DataFrame({
+      'data_cadastro': datas,
+      'cancelado': [1, 0] * 7,
+      'total_gasto': [100] * 14,
+      'duracao_contrato': ['Mensal'] * 14
+    })
+    acumulados = construir_acumulados(df)
+
+    tendencia = calcular_tendencia_movel(acumulados, 7, '2024-01-01', '2024-01-14')
+
+    assert len(tendencia) == 14
+    # Primeiro dia: janela só tem o próprio dia (1 cancelado de 1)
+    assert tendencia['taxa_churn'].iloc[0] == 100.0
+    # Último dia: janela de 7 dias (8 a 14 de jan) tem 3 cancelados
+    assert tendencia['media_cancelamentos'].iloc[-1] == pytest.approx(3 / 7)
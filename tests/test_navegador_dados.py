@@ -0,0 +1,190 @@
+"""
+Testes para o navegador paginado dos dados brutos.
+
+As páginas devem trazer as mesmas linhas que filtrar e ordenar o
+DataFrame inteiro, mas só o recorte da página.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import gc
+import sys
+import os
+import weakref
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from navegador_dados import NavegadorDados
+from base_compartilhada import preparar_base
+from gerador_base import gerar_dados_cenario
+
+
+@pytest.fixture
+def base():
+  """
+  Base preparada como no app (categorias e colunas somente leitura).
+  """
+  return preparar_base(gerar_dados_cenario(3000, 'producao'))
+
+
+class TestPagina:
+  """
+  Testes para a paginação.
+  """
+
+  def test_pagina_igual_ao_sort_do_dataframe(self, base):
+    """
+    Testa se a página 3 ordenada por total_gasto bate com o sort do pandas.
+    """
+    # Arrange
+    navegador = NavegadorDados(base)
+    mascara = (base['duracao_contrato'] == 'Mensal').to_numpy()
+    esperado = base[mascara].sort_values('total_gasto', kind='stable')
+
+    # Act
+    pagina, total_paginas, total = navegador.pagina(base, mascara, 3, 25, 'total_gasto')
+
+    # Assert
+    assert total == mascara.sum()
+    assert total_paginas == -(-total // 25)
+    assert pagina['id_cliente'].tolist() == esperado['id_cliente'].iloc[50:75].tolist()
+
+  def test_ordem_decrescente_e_categorias(self, base):
+    """
+    Testa ordenação decrescente por coluna categórica (ordem alfabética).
+    """
+    navegador = NavegadorDados(base)
+    mascara = np.ones(len(base), dtype=bool)
+
+    pagina, _, _ = navegador.pagina(base, mascara, 1, 10, 'assinatura', crescente=False)
+
+    assert (pagina['assinatura'] == 'Standard').all()
+
+  def test_decrescente_estavel_com_ausentes_no_fim(self, base):
+    """
+    Testa a ordem decrescente com empates e NaN: igual ao sort do pandas
+    (empates na ordem original, NaN no fim).
+    """
+    # Arrange
+    base = base.copy()
+    base['dias_atraso'] = base['dias_atraso'].astype(float)
+    base.loc[base.index[::7], 'dias_atraso'] = np.nan
+    navegador = NavegadorDados(base)
+    mascara = np.ones(len(base), dtype=bool)
+    esperado = base.sort_values('dias_atraso', ascending=False, kind='stable', na_position='last')
+
+    # Act
+    pagina, _, total = navegador.pagina(base, mascara, 1, len(base), 'dias_atraso', crescente=False)
+
+    # Assert
+    assert total == len(base)
+    assert pagina['id_cliente'].tolist() == esperado['id_cliente'].tolist()
+
+  @pytest.mark.parametrize('crescente', [True, False])
+  def test_texto_com_ausentes(self, crescente):
+    """
+    Testa ordenação de coluna de texto (object) com valores ausentes.
+    """
+    df = pd.DataFrame({
+      'id_cliente': np.arange(6),
+      'genero': ['Masculino', None, 'Feminino', np.nan, 'Masculino', 'Feminino']
+    })
+    navegador = NavegadorDados(df)
+    esperado = df.sort_values('genero', ascending=crescente, kind='stable', na_position='last')
+
+    pagina, _, _ = navegador.pagina(df, np.ones(len(df), dtype=bool), 1, 10, 'genero', crescente)
+
+    assert pagina['id_cliente'].tolist() == esperado['id_cliente'].tolist()
+
+  def test_sem_ordenacao_usa_ordem_original(self, base):
+    """
+    Testa a primeira página sem ordenação: as primeiras linhas filtradas.
+    """
+    navegador = NavegadorDados(base)
+    mascara = (base['cancelado'] == 1).to_numpy()
+
+    pagina, _, _ = navegador.pagina(base, mascara, 1, 10)
+
+    assert pagina.index.tolist() == base[mascara].index[:10].tolist()
+
+  def test_pagina_alem_do_fim(self, base):
+    """
+    Testa página maior que o total: volta a última página.
+    """
+    navegador = NavegadorDados(base)
+    mascara = np.zeros(len(base), dtype=bool)
+    mascara[:15] = True
+
+    pagina, total_paginas, _ = navegador.pagina(base, mascara, 99, 10)
+
+    assert total_paginas == 2
+    assert len(pagina) == 5
+
+
+class TestBuscarCliente:
+  """
+  Testes para a busca por id_cliente.
+  """
+
+  def test_busca_id_existente(self, base):
+    """
+    Testa busca de um id presente na base.
+    """
+    navegador = NavegadorDados(base)
+
+    posicoes = navegador.buscar_cliente(1234)
+
+    assert base['id_cliente'].iloc[posicoes].tolist() == [1234]
+
+  def test_busca_id_inexistente(self, base):
+    """
+    Testa busca de um id que não existe.
+    """
+    navegador = NavegadorDados(base)
+
+    assert len(navegador.buscar_cliente(999999)) == 0
+
+  def test_ids_fora_de_ordem_e_repetidos(self):
+    """
+    Testa o índice com ids embaralhados e repetidos.
+    """
+    df = pd.DataFrame({'id_cliente': [30, 10, 20, 10], 'total_gasto': [1.0, 2.0, 3.0, 4.0]})
+    navegador = NavegadorDados(df)
+
+    assert navegador.buscar_cliente(10).tolist() == [1, 3]
+    assert navegador.buscar_cliente(30).tolist() == [0]
+
+
+class TestMemoria:
+  """
+  Testes para a relação entre o navegador e a base.
+  """
+
+  def test_navegador_nao_mantem_base_viva(self):
+    """
+    Testa se a base é liberada mesmo com o navegador (e suas ordenações) em uso.
+    """
+    # Arrange
+    base = preparar_base(gerar_dados_cenario(500, 'padrao'))
+    navegador = NavegadorDados(base)
+    navegador.ordem(base, 'total_gasto')
+    referencia = weakref.ref(base)
+
+    # Act
+    del base
+    gc.collect()
+
+    # Assert
+    assert referencia() is None
+    assert len(navegador.buscar_cliente(1)) == 1
+
+  def test_base_de_outro_tamanho(self, base):
+    """
+    Testa se usar o navegador com uma base de outra versão (outro tamanho) gera erro.
+    """
+    navegador = NavegadorDados(base)
+    mascara = np.ones(100, dtype=bool)
+
+    with pytest.raises(ValueError):
+      navegador.pagina(base.iloc[:100], mascara, 1, 10)
@@ -0,0 +1,138 @@
+"""
+Testes para a descoberta de segmentos de risco.
+
+Os números de cada segmento devem bater com o filtro equivalente
+feito diretamente no DataFrame.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from segmentos import calcular_segmentos, ranquear_segmentos, descrever_segmento, QUALQUER
+from gerador_base import gerar_dados_cenario
+
+
+@pytest.fixture
+def segmentos_base():
+  """
+  Base gerada e os segmentos calculados sobre ela.
+  """
+  base = gerar_dados_cenario(5000, 'producao')
+  return base, calcular_segmentos(base)
+
+
+class TestCalcularSegmentos:
+  """
+  Testes para o cálculo de todos os segmentos.
+  """
+
+  def test_segmento_de_uma_dimensao(self, segmentos_base):
+    """
+    Testa um segmento simples: todos os contratos mensais.
+    """
+    base, segmentos = segmentos_base
+    mensais = base[base['duracao_contrato'] == 'Mensal']
+
+    linha = segmentos[(segmentos['n_dimensoes'] == 1) & (segmentos['duracao_contrato'] == 'Mensal')].iloc[0]
+
+    assert linha['clientes'] == len(mensais)
+    assert linha['cancelados'] == mensais['cancelado'].sum()
+    assert linha['receita_perdida'] == pytest.approx(mensais[mensais['cancelado'] == 1]['total_gasto'].sum())
+
+  def test_cancelado_e_gasto_ausentes(self):
+    """
+    Testa se cancelado e total_gasto vazios não quebram o cálculo nem contam como churn.
+    """
+    # Arrange
+    base = gerar_dados_cenario(2000, 'padrao')
+    base['cancelado'] = base['cancelado'].astype(float)
+    base.loc[0:19, 'cancelado'] = np.nan
+    base.loc[20:39, 'total_gasto'] = np.nan
+    mensais = base[base['duracao_contrato'] == 'Mensal']
+
+    # Act
+    segmentos = calcular_segmentos(base)
+
+    # Assert
+    linha = segmentos[(segmentos['n_dimensoes'] == 1) & (segmentos['duracao_contrato'] == 'Mensal')].iloc[0]
+    assert linha['clientes'] == len(mensais)
+    assert linha['cancelados'] == (mensais['cancelado'] == 1).sum()
+    assert linha['receita_perdida'] == pytest.approx(mensais[mensais['cancelado'] == 1]['total_gasto'].sum())
+
+  def test_segmento_com_faixas(self, segmentos_base):
+    """
+    Testa um segmento com faixa etária e faixa de atraso.
+    """
+    base, segmentos = segmentos_base
+    filtro = base[(base['idade'] >= 55) & (base['dias_atraso'] >= 31) & (base['assinatura'] == 'Basico')]
+
+    linha = segmentos[
+      (segmentos['n_dimensoes'] == 3) &
+      (segmentos['assinatura'] == 'Basico') &
+      (segmentos['faixa_etaria'] == '55+') &
+      (segmentos['faixa_atraso'] == '31+ dias')
+    ].iloc[0]
+
+    assert linha['clientes'] == len(filtro)
+    assert linha['taxa_churn'] == pytest.approx(filtro['cancelado'].mean() * 100)
+
+  def test_cada_nivel_soma_a_base(self, segmentos_base):
+    """
+    Testa se, para cada conjunto de dimensões, os segmentos somam a base inteira.
+    """
+    base, segmentos = segmentos_base
+
+    contrato_e_genero = segmentos[
+      (segmentos['n_dimensoes'] == 2) &
+      (segmentos['duracao_contrato'] != QUALQUER) &
+      (segmentos['genero'] != QUALQUER)
+    ]
+
+    assert contrato_e_genero['clientes'].sum() == len(base)
+    assert contrato_e_genero['cancelados'].sum() == base['cancelado'].sum()
+
+
+class TestRanquearSegmentos:
+  """
+  Testes para o ranking dos segmentos.
+  """
+
+  def test_respeita_tamanho_minimo_e_ordem(self, segmentos_base):
+    """
+    Testa filtro por tamanho mínimo e ordenação decrescente.
+    """
+    _, segmentos = segmentos_base
+
+    ranking = ranquear_segmentos(segmentos, minimo_clientes=200, ordenar_por='receita_perdida', limite=10)
+
+    assert len(ranking) == 10
+    assert (ranking['clientes'] >= 200).all()
+    assert ranking['receita_perdida'].is_monotonic_decreasing
+
+  def test_criterio_invalido(self, segmentos_base):
+    """
+    Testa se um critério de ordenação desconhecido gera erro.
+    """
+    _, segmentos = segmentos_base
+
+    with pytest.raises(ValueError):
+      ranquear_segmentos(segmentos, ordenar_por='idade')
+
+  def test_descrever_segmento(self):
+    """
+    Testa o texto do segmento (dimensões livres não aparecem).
+    """
+    segmento = pd.Series({
+      'assinatura': 'Basico',
+      'duracao_contrato': QUALQUER,
+      'genero': QUALQUER,
+      'faixa_etaria': '55+',
+      'faixa_atraso': '31+ dias'
+    })
+
+    assert descrever_segmento(segmento) == 'Basico · 55+ · 31+ dias'
@@ -0,0 +1,189 @@
+"""
+Testes para os snapshots versionados e a comparação entre versões.
+
+A comparação vetorizada deve apontar exatamente os clientes que mudaram
+entre duas versões da base.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from snapshots import (
+  criar_snapshot,
+  salvar_snapshot,
+  listar_snapshots,
+  carregar_snapshot,
+  comparar_snapshots,
+  MAXIMO_SNAPSHOTS,
+  OUTROS_CAMPOS,
+  ESTADO_NOVO,
+  ESTADO_REMOVIDO,
+  ESTADO_CANCELADO,
+  ESTADO_DESCONHECIDO
+)
+from gerador_base import gerar_dados_cenario
+
+
+@pytest.fixture
+def versoes():
+  """
+  Duas versões da base: 20 novos cancelamentos, 5 reativações, 3 mudanças
+  de idade, 10 clientes removidos e 4 clientes novos.
+  """
+  np.random.seed(0)
+  antiga = gerar_dados_cenario(1000, 'padrao')
+  nova = antiga.copy()
+
+  ativos = np.flatnonzero(antiga['cancelado'].to_numpy() == 0)
+  cancelados = np.flatnonzero(antiga['cancelado'].to_numpy() == 1)
+  nova.loc[ativos[-20:], 'cancelado'] = 1
+  nova.loc[cancelados[-5:], 'cancelado'] = 0
+  nova.loc[ativos[-23:-20], 'idade'] += 1
+
+  entradas = antiga.iloc[:4].copy()
+  entradas['id_cliente'] += 100000
+  nova = pd.concat([nova.iloc[10:], entradas]).sample(frac=1, random_state=0)
+
+  return antiga, nova
+
+
+class TestCompararSnapshots:
+  """
+  Testes para a comparação entre duas versões.
+  """
+
+  def test_aponta_cada_tipo_de_mudanca(self, versoes):
+    """
+    Testa as contagens de novos cancelamentos, reativações, novos e removidos.
+    """
+    # Arrange
+    antiga, nova = versoes
+    ids_removidos = set(antiga['id_cliente'].iloc[:10])
+    ativos = antiga[antiga['cancelado'] == 0]['id_cliente']
+    esperados = set(ativos.iloc[-20:]) - ids_removidos
+
+    # Act
+    resultado = comparar_snapshots(criar_snapshot(antiga), criar_snapshot(nova))
+
+    # Assert
+    assert set(resultado['novos_cancelados']['id_cliente']) == esperados
+    assert len(resultado['reativacoes']) == 5
+    assert set(resultado['removidos']['id_cliente']) == ids_removidos
+    assert len(resultado['novos_clientes']) == 4
+
+  def test_campos_alterados(self, versoes):
+    """
+    Testa se mudanças fora das colunas-chave aparecem como 'outros campos'.
+    """
+    antiga, nova = versoes
+
+    alterados = comparar_snapshots(criar_snapshot(antiga), criar_snapshot(nova))['alterados']
+
+    contagem = alterados['campos_alterados'].value_counts()
+    assert contagem['cancelado'] == len(alterados) - 3
+    assert contagem[OUTROS_CAMPOS] == 3
+
+  def test_fluxo_soma_todos_os_clientes(self, versoes):
+    """
+    Testa se o fluxo cobre todos os clientes das duas versões.
+    """
+    antiga, nova = versoes
+
+    fluxo = comparar_snapshots(criar_snapshot(antiga), criar_snapshot(nova))['fluxo']
+
+    assert fluxo[fluxo['destino'] != ESTADO_REMOVIDO]['clientes'].sum() == len(nova)
+    assert fluxo[fluxo['origem'] != ESTADO_NOVO]['clientes'].sum() == len(antiga)
+
+  def test_cancelado_ausente(self, versoes, tmp_path):
+    """
+    Testa se 'cancelado' vazio vira <NA> no snapshot e não conta como cancelamento.
+    """
+    # Arrange
+    antiga, nova = versoes
+    antiga = antiga.astype({'cancelado': float})
+    nova = nova.astype({'cancelado': float})
+    ativo = antiga.loc[antiga['cancelado'] == 0, 'id_cliente'].iloc[20]
+    antiga.loc[antiga['id_cliente'] == ativo, 'cancelado'] = np.nan
+    nova.loc[nova['id_cliente'] == ativo, 'cancelado'] = 1
+    caminho = salvar_snapshot(antiga, tmp_path, 'base', 1)
+
+    # Act
+    snapshot_antigo = carregar_snapshot(tmp_path, 'base', 1)
+    resultado = comparar_snapshots(snapshot_antigo, criar_snapshot(nova))
+
+    # Assert
+    assert caminho.exists()
+    assert snapshot_antigo['cancelado'].isna().sum() == 1
+    assert ativo not in set(resultado['novos_cancelados']['id_cliente'])
+    alterado = resultado['alterados'][resultado['alterados']['id_cliente'] == ativo]
+    assert alterado['campos_alterados'].tolist() == ['cancelado']
+    fluxo = resultado['fluxo']
+    assert fluxo[(fluxo['origem'] == ESTADO_DESCONHECIDO) & (fluxo['destino'] == ESTADO_CANCELADO)]['clientes'].sum() == 1
+
+  def test_mesmos_dados_com_outros_tipos(self, versoes):
+    """
+    Testa se a mesma base com outros tipos (cancelado float por causa de um
+    NaN, inteiros como float, textos como object, datas como texto) só
+    aponta a linha que de fato mudou.
+    """
+    # Arrange
+    antiga, _ = versoes
+    nova = antiga.astype({'cancelado': float, 'idade': float, 'genero': str, 'assinatura': str})
+    nova['data_cadastro'] = nova['data_cadastro'].dt.strftime('%Y-%m-%d')
+    ausente = nova['id_cliente'].iloc[0]
+    nova.loc[nova['id_cliente'] == ausente, 'cancelado'] = np.nan
+
+    # Act
+    sem_nan = comparar_snapshots(criar_snapshot(antiga), criar_snapshot(nova.iloc[1:]))
+    com_nan = comparar_snapshots(criar_snapshot(antiga), criar_snapshot(nova))
+
+    # Assert
+    assert len(sem_nan['alterados']) == 0
+    assert com_nan['alterados']['id_cliente'].tolist() == [ausente]
+    assert com_nan['alterados']['campos_alterados'].tolist() == ['cancelado']
+
+  def test_versoes_iguais_sem_mudancas(self, versoes):
+    """
+    Testa se a mesma base comparada com ela mesma não tem mudanças.
+    """
+    antiga, _ = versoes
+    snapshot = criar_snapshot(antiga)
+
+    resultado = comparar_snapshots(snapshot, snapshot)
+
+    for chave in ['novos_cancelados', 'reativacoes', 'alterados', 'novos_clientes', 'removidos']:
+      assert len(resultado[chave]) == 0
+
+
+class TestSalvarSnapshot:
+  """
+  Testes para a gravação dos snapshots em disco.
+  """
+
+  def test_salva_lista_e_carrega(self, versoes, tmp_path):
+    """
+    Testa se o snapshot salvo volta igual ao criado.
+    """
+    antiga, _ = versoes
+
+    salvar_snapshot(antiga, tmp_path, 'base', 100)
+
+    assert listar_snapshots(tmp_path, 'base') == [100]
+    pd.testing.assert_frame_equal(carregar_snapshot(tmp_path, 'base', 100), criar_snapshot(antiga))
+
+  def test_mantem_apenas_os_mais_recentes(self, versoes, tmp_path):
+    """
+    Testa se só os MAXIMO_SNAPSHOTS snapshots mais recentes ficam em disco.
+    """
+    antiga, _ = versoes
+    pequena = antiga.iloc[:10]
+
+    for versao in range(MAXIMO_SNAPSHOTS + 3):
+      salvar_snapshot(pequena, tmp_path, 'base', versao)
+
+    assert listar_snapshots(tmp_path, 'base') == list(range(3, MAXIMO_SNAPSHOTS + 3))
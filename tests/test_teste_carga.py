@@ -0,0 +1,36 @@
+"""
+Teste rápido do harness de carga.
+
+Sobe um servidor real com uma base pequena e roda poucas sessões
+simultâneas, só para garantir que o harness e o app continuam funcionando
+juntos.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from teste_carga import executar_carga
+
+
+class TestExecutarCarga:
+  """
+  Testes para o harness de carga.
+  """
+
+  def test_niveis_sem_erros(self):
+    """
+    Testa os níveis de 1 e 2 sessões simultâneas, com duas interações cada.
+    """
+    resumo = executar_carga(niveis=[2, 1], n_reruns=2, n_clientes=2000, cenario='padrao')
+
+    assert resumo['erros'] == 0, resumo['exemplos_erros']
+    assert [nivel['sessoes'] for nivel in resumo['niveis']] == [1, 2]
+    for nivel in resumo['niveis']:
+      assert nivel['rerun_p50_ms'] <= nivel['rerun_p95_ms'] <= nivel['rerun_max_ms']
+      assert nivel['vazao_reruns_s'] > 0
+    # As duas sessões abrem a página juntas: os reruns se sobrepõem no servidor
+    assert resumo['niveis'][1]['reruns_simultaneos_max'] == 2
+    assert 'CHURN_DIR_DADOS' not in os.environ